@@ -0,0 +1,269 @@
+"""
+Offscreen benchmark of the compose hot path.
+
+    python -m render.bench [--out bench.json] [--iterations N] [--quick] [--baseline old.json]
+
+Drives Renderer.compose and MainWindow._compose over a matrix of skins
+(1, 8 and 200 generated frames), uiScale values, outline on/off and text
+lengths. Each case reports compose latency percentiles, the tracemalloc
+peak and net block count of the Python side, and how many QPixmaps were
+created per second (constructors, fromImage and the copying transforms). Results are written as JSON; with
+--baseline the p50 of every matching case is compared against an older
+run so regressions show up between builds.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+import PySide6
+from PySide6.QtGui import QColor, QImage, QPixmap
+from PySide6.QtWidgets import QApplication
+from services.perf import _percentile
+
+SKINS = (("single", 1), ("anim8", 8), ("anim200", 200))
+SCALES = (0.5, 1.0, 1.5, 2.0, 3.0)
+TEXTS = ("5:00", "25:00", "120:00:00")
+OUTLINES = (False, True)
+# A countdown shows a new text about every tenth animation frame
+TEXT_EVERY = 10
+
+
+class _PixmapCounter:
+    """
+    Counts every QPixmap created from Python while active: constructors,
+    fromImage and the methods returning a new pixmap (scaled, copy, ...).
+    The methods are swapped on QPixmap itself, so calls from any module count.
+    """
+    FACTORIES = ("fromImage", "fromImageReader")
+    TRANSFORMS = ("scaled", "scaledToWidth", "scaledToHeight", "copy", "transformed")
+
+    def __init__(self):
+        self.count = 0
+        self._originals = {}
+
+    def __enter__(self):
+        counter = self
+
+        def counting(func, static=False):
+            def wrapper(*args, **kwargs):
+                counter.count += 1
+                return func(*args, **kwargs)
+            return staticmethod(wrapper) if static else wrapper
+
+        for name in ("__init__",) + self.FACTORIES + self.TRANSFORMS:
+            raw = QPixmap.__dict__[name]
+            self._originals[name] = raw
+            setattr(QPixmap, name, counting(getattr(QPixmap, name), static=name in self.FACTORIES))
+        return self
+
+    def __exit__(self, *exc):
+        for name, raw in self._originals.items():
+            setattr(QPixmap, name, raw)
+        self._originals.clear()
+
+
+def _make_skin(root, name, count):
+    base = os.path.join(root, name)
+    os.makedirs(base, exist_ok=True)
+    for i in range(count):
+        img = QImage(256, 256, QImage.Format_ARGB32)
+        img.fill(QColor.fromHsv((i * 7) % 360, 160, 200))
+        path = "skin.png" if count == 1 else f"skin_{i:03d}.png"
+        img.save(os.path.join(base, path), "PNG")
+    return base
+
+
+def _measure(step, iterations, counter):
+    """Time `iterations` calls of step(i), then repeat a shorter pass under tracemalloc."""
+    for i in range(min(20, iterations)):
+        step(i)  # warm caches (atlases, layers) before timing
+
+    timings = []
+    counter.count = 0
+    started = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        step(i)
+        timings.append((time.perf_counter() - t0) * 1000.0)
+    wall = time.perf_counter() - started
+    pixmaps = counter.count
+
+    alloc_iterations = max(1, iterations // 4)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for i in range(alloc_iterations):
+        step(i)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    net_blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+
+    timings.sort()
+    return {
+        "iterations": iterations,
+        "mean_ms": round(statistics.fmean(timings), 4),
+        "p50_ms": round(_percentile(timings, 0.50), 4),
+        "p90_ms": round(_percentile(timings, 0.90), 4),
+        "p99_ms": round(_percentile(timings, 0.99), 4),
+        "max_ms": round(timings[-1], 4),
+        "alloc_peak_kb": round(peak / 1024.0, 1),
+        "alloc_net_blocks_per_compose": round(net_blocks / alloc_iterations, 2),
+        "pixmaps_per_compose": round(pixmaps / iterations, 3),
+        "pixmaps_per_sec": round(pixmaps / wall, 1) if wall > 0 else 0.0,
+    }
+
+
+def _texts_for(text):
+    # Vary the last digit so the text layer changes like a running countdown
+    return [text[:-1] + str(d) for d in range(10)]
+
+
+def run(iterations=200, quick=False):
+    from services import audio_service
+    from services.config_service import ConfigService
+    from services.stats_service import StatsService, SqliteStatsService
+    from skin import frame_cache
+
+    work = tempfile.mkdtemp(prefix="bitomato_bench_")
+    cwd = os.getcwd()
+    # Keep the app's own files untouched: every path points into the scratch dir
+    os.chdir(work)
+    ConfigService.PATH = os.path.join(work, "config.json")
+    ConfigService.LKG_PATH = os.path.join(work, "config.last_good.json")
+    StatsService.PATH = os.path.join(work, "stats.json")
+    StatsService.LOG_PATH = os.path.join(work, "sessions.jsonl")
+    SqliteStatsService.PATH = os.path.join(work, "stats.db")
+    # Fixed at import time from the original working directory
+    frame_cache.CACHE_DIR = os.path.join(work, "cache", "skins")
+    audio_service.CACHE_DIR = os.path.join(work, "cache", "sounds")
+    try:
+        return _run_matrix(work, iterations, quick)
+    finally:
+        # Background cache writes started by the windows must not outlive the scratch dir
+        for t in threading.enumerate():
+            if t.name == frame_cache.WRITER_NAME:
+                t.join()
+        ConfigService.flush()
+        os.chdir(cwd)
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def _run_matrix(work, iterations, quick):
+    from services.config_service import Config
+    from skin.loader import load_skin
+    from render.renderer import Renderer
+    from ui.main_window import MainWindow
+
+    skins = SKINS[:2] if quick else SKINS
+    scales = (1.0, 2.0) if quick else SCALES
+    texts = TEXTS[1:2] if quick else TEXTS
+    counter = _PixmapCounter()
+    results = []
+
+    with counter:
+        for skin_name, count in skins:
+            path = _make_skin(work, skin_name, count)
+            for scale in scales:
+                frames, _, _ = load_skin(path, scale, use_cache=False)
+                renderer = Renderer(path)
+                window = MainWindow(Config({"skinId": path, "uiScale": scale}))
+                for outline in OUTLINES:
+                    for text in texts:
+                        variants = _texts_for(text)
+                        case = {"skin": skin_name, "frames": count, "scale": scale, "outline": outline, "text_length": len(text)}
+
+                        def compose_step(i):
+                            renderer.compose(
+                                frames[i % len(frames)], variants[(i // TEXT_EVERY) % len(variants)],
+                                False, True, scale=scale, text_color=QColor(255, 255, 255),
+                                outline_enabled=outline, outline_color=QColor(0, 0, 0), outline_width=1,
+                            )
+
+                        results.append(dict(case, target="Renderer.compose", **_measure(compose_step, iterations, counter)))
+
+                        window.config["textOutlineEnabled"] = outline
+
+                        def window_step(i):
+                            window.frame_index = i % len(window.frames)
+                            window.text = variants[(i // TEXT_EVERY) % len(variants)]
+                            window._compose()
+
+                        results.append(dict(case, target="MainWindow._compose", **_measure(window_step, iterations, counter)))
+                window.close()
+                window.deleteLater()
+                print(f"{skin_name} x{scale}: done")
+
+    return {
+        "meta": {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pyside": PySide6.__version__,
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM"),
+            "iterations": iterations,
+            "text_every": TEXT_EVERY,
+        },
+        "results": results,
+    }
+
+
+def _case_key(row):
+    return (row["target"], row["skin"], row["scale"], row["outline"], row["text_length"])
+
+
+def compare(report, baseline, threshold=1.2):
+    """Print cases whose p50 grew by more than threshold compared to the baseline run."""
+    old = {_case_key(row): row for row in baseline.get("results", [])}
+    regressions = 0
+    for row in report["results"]:
+        prev = old.get(_case_key(row))
+        if not prev or prev["p50_ms"] <= 0:
+            continue
+        ratio = row["p50_ms"] / prev["p50_ms"]
+        if ratio > threshold:
+            regressions += 1
+            print(f"REGRESSION {row['target']} {row['skin']} x{row['scale']} outline={row['outline']} "
+                  f"len={row['text_length']}: p50 {prev['p50_ms']} -> {row['p50_ms']} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Renderer.compose and MainWindow._compose offscreen")
+    parser.add_argument("--out", default="bench.json", help="JSON report path (default: bench.json)")
+    parser.add_argument("--iterations", type=int, default=200, help="timed composes per case")
+    parser.add_argument("--quick", action="store_true", help="reduced matrix for a fast smoke run")
+    parser.add_argument("--baseline", default=None, help="earlier JSON report to compare p50 against")
+    args = parser.parse_args(argv)
+
+    out_path = os.path.abspath(args.out)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    report = run(args.iterations, args.quick)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Wrote {len(report['results'])} cases to {out_path}")
+    if baseline is not None:
+        return 1 if compare(report, baseline) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+import math
+from PySide6.QtGui import QPainter, QPixmap, QColor, QFontMetrics, QPainterPath, QPen
+from PySide6.QtCore import QRect, QPoint, Qt
+
+# The countdown only ever shows digits and a colon
+GLYPHS = "0123456789:"
+
+
+class GlyphAtlas:
+    """
+    One text style (font size, colours, outline, uiScale) rasterised once
+    into a horizontal strip of glyph cells at device resolution.
+    Strings are then assembled with integer-positioned blits.
+    """
+
+    def __init__(self, font, scale, text_color, outline_enabled=False, outline_color=None, outline_width=2):
+        fm = QFontMetrics(font)
+        self.scale = scale
+        self.advances = {ch: fm.horizontalAdvance(ch) for ch in GLYPHS}
+        # Logical padding around each glyph for the outline stroke
+        pad = int(math.ceil(outline_width / 2)) + 1 if outline_enabled else 1
+        height = fm.height()
+        self.oy = int(math.ceil(pad * scale))
+        cell_h = self.oy + int(math.ceil((height + pad) * scale))
+
+        # Lay out the cells: (strip x, cell width, glyph origin offset) in device pixels
+        self.cells = {}
+        x = 0
+        for ch in GLYPHS:
+            br = fm.boundingRect(ch)
+            left = min(0, br.left()) - pad
+            right = max(self.advances[ch], br.right() + 1) + pad
+            ox = int(math.ceil(-left * scale))
+            width = ox + int(math.ceil(right * scale))
+            self.cells[ch] = (x, width, ox)
+            x += width
+
+        self.strip = QPixmap(max(x, 1), max(cell_h, 1))
+        self.strip.fill(Qt.transparent)
+        p = QPainter(self.strip)
+        p.setRenderHint(QPainter.TextAntialiasing, False)
+        p.setFont(font)
+        if outline_enabled:
+            p.setPen(QPen(outline_color if outline_color is not None else QColor(0, 0, 0), outline_width))
+            p.setBrush(text_color)
+        else:
+            p.setPen(text_color)
+        for ch, (sx, width, ox) in self.cells.items():
+            p.save()
+            p.translate(sx + ox, self.oy)
+            p.scale(scale, scale)
+            if outline_enabled:
+                path = QPainterPath()
+                path.addText(0, fm.ascent(), font, ch)
+                p.drawPath(path)
+            else:
+                p.drawText(QRect(0, 0, self.advances[ch] + 2 * pad, height), Qt.AlignLeft | Qt.AlignTop, ch)
+            p.restore()
+        p.end()
+
+    @staticmethod
+    def supports(text):
+        return all(ch in GLYPHS for ch in text)
+
+    def text_width(self, text):
+        return sum(self.advances[ch] for ch in text)
+
+    def draw(self, p, x, y, text):
+        """Blit text with its top-left logical origin at device pixel (x, y)."""
+        pen = 0
+        for ch in text:
+            sx, width, ox = self.cells[ch]
+            dx = x + int(round(pen * self.scale)) - ox
+            p.drawPixmap(QPoint(dx, y - self.oy), self.strip, QRect(sx, 0, width, self.strip.height()))
+            pen += self.advances[ch]
@@ -1,19 +1,48 @@
 from PySide6.QtGui import QFontDatabase, QFont, QPainter, QPixmap, QImage, QColor, QFontMetrics, QPainterPath, QPen
-from PySide6.QtCore import QRect, Qt, QPoint
+from PySide6.QtCore import QRect, QRectF, Qt, QPoint
 import os
 import sys
+from render.glyph_atlas import GlyphAtlas, GLYPHS
 
 if getattr(sys, 'frozen', False):
     ROOT = sys._MEIPASS
 else:
     ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
 
+# Logical layout (skin coordinates, before uiScale)
+TEXT_RECT = QRect(53, 173, 256 - 53, 256 - 173)
+# Outline strokes may bleed a few pixels left/up of the text box
+TEXT_LAYER_RECT = QRect(53 - 4, 173 - 4, 256 - 53 + 4, 256 - 173 + 4)
+BUTTON_SIZE = 24
+BUTTON_LAYER_RECT = QRect(132, 230, 196 + BUTTON_SIZE - 132, BUTTON_SIZE)
+BASE_FONT_SIZE = 48
+MAX_ATLASES = 16
+# Performance overlay (top-left corner, small pixel font)
+OVERLAY_RECT = QRect(2, 2, 64, 38)
+OVERLAY_FONT_SIZE = 6
+OVERLAY_LINE_HEIGHT = 12
+
 
 class Renderer:
     def __init__(self, skin_path=None):
         self.font_id = None
         self.font = None
         self._load_font()
+        fm = QFontMetrics(self.font)
+        self._base_advances = {ch: fm.horizontalAdvance(ch) for ch in GLYPHS}
+        self._sized_fonts = {BASE_FONT_SIZE: self.font}
+        self._atlases = {}
+        # Layer caches: each layer is re-rasterised only when its key changes
+        self._canvas = None
+        self._skin_key = None
+        self._skin_layer = None
+        self._text_key = None
+        self._text_layer = None
+        self._button_key = None
+        self._button_layer = None
+        self._overlay_key = None
+        self._overlay_layer = None
+        self.dirty_rect = QRect()
         self.reload(skin_path)
 
     def reload(self, skin_path=None):
@@ -28,6 +57,14 @@ class Renderer:
         self.icon_pause = self._load_icon(_get_path("pause.png"))
         self.icon_setting = self._load_icon(_get_path("setting.png"))
         self.icon_reset = self._load_icon(_get_path("reset.png"))
+        self.invalidate()
+
+    def invalidate(self):
+        """Drop all cached layers so the next compose repaints the whole canvas."""
+        self._skin_key = None
+        self._text_key = None
+        self._button_key = None
+        self._overlay_key = None
 
     def _load_font(self):
         path = os.path.join(ROOT, "assets", "fonts", "Minecraftia-Regular.ttf")
@@ -36,12 +73,12 @@ class Renderer:
             families = QFontDatabase.applicationFontFamilies(self.font_id)
             if families:
                 f = QFont(families[0])
-                f.setPixelSize(48)
+                f.setPixelSize(BASE_FONT_SIZE)
                 f.setStyleStrategy(QFont.NoAntialias)
                 self.font = f
         if self.font is None:
             f = QFont("Courier New")
-            f.setPixelSize(48)
+            f.setPixelSize(BASE_FONT_SIZE)
             f.setStyleStrategy(QFont.NoAntialias)
             self.font = f
 
@@ -54,39 +91,167 @@ class Renderer:
         img.fill(QColor(255, 255, 255, 255))
         return QPixmap.fromImage(img)
 
-    def compose(self, base_frame, text, show_pause_icon, show_setting_icon, scale=1, text_color=None, outline_enabled=False, outline_color=None, outline_width=2):
-        w = int(base_frame.width() * scale)
-        h = int(base_frame.height() * scale)
-        canvas = QPixmap(w, h)
-        canvas.fill(Qt.transparent)
-        p = QPainter(canvas)
+    @staticmethod
+    def _device_rect(rect, scale):
+        # Map a logical rect to whole device pixels covering it
+        return QRectF(rect.x() * scale, rect.y() * scale, rect.width() * scale, rect.height() * scale).toAlignedRect()
+
+    def _new_layer(self, device_rect, scale):
+        layer = QPixmap(device_rect.size())
+        layer.fill(Qt.transparent)
+        p = QPainter(layer)
         p.setRenderHint(QPainter.SmoothPixmapTransform, False)
         p.setRenderHint(QPainter.TextAntialiasing, False)
+        p.translate(-device_rect.x(), -device_rect.y())
+        p.scale(scale, scale)
+        return layer, p
+
+    def compose(self, base_frame, text, show_pause_icon, show_setting_icon, scale=1, text_color=None, outline_enabled=False, outline_color=None, outline_width=2, overlay=None):
+        """
+        Composite skin, text and button layers into a persistent canvas.
+        Only layers whose inputs changed are re-rasterised; the union of the
+        touched areas (device pixels) is left in self.dirty_rect.
+        overlay: optional tuple of short text lines (performance overlay).
+        """
+        w = int(256 * scale)
+        h = int(256 * scale)
+        canvas_rect = QRect(0, 0, w, h)
+        dirty = QRect()
+        if self._canvas is None or self._canvas.width() != w or self._canvas.height() != h:
+            self._canvas = QPixmap(w, h)
+            self.invalidate()
         if text_color is None:
             text_color = QColor(255, 255, 255)
-        
+        if outline_color is None:
+            outline_color = QColor(0, 0, 0)
+
+        # 1. Skin layer
+        skin_key = (base_frame.cacheKey(), w, h)
+        if skin_key != self._skin_key:
+            if base_frame.width() == w and base_frame.height() == h:
+                self._skin_layer = base_frame
+            else:
+                self._skin_layer = base_frame.scaled(w, h, Qt.IgnoreAspectRatio, Qt.FastTransformation)
+            self._skin_key = skin_key
+            dirty = canvas_rect
+
+        # 2. Text layer
+        text_key = (text, text_color.rgba(), outline_enabled, outline_color.rgba() if outline_enabled else None, outline_width if outline_enabled else None, scale)
+        if text_key != self._text_key:
+            device_rect = self._device_rect(TEXT_LAYER_RECT, scale).intersected(canvas_rect)
+            layer, p = self._new_layer(device_rect, scale)
+            self._draw_text(p, text, text_color, outline_enabled, outline_color, outline_width, scale, device_rect.topLeft())
+            p.end()
+            self._text_layer = (device_rect, layer)
+            self._text_key = text_key
+            dirty = dirty.united(device_rect)
+
+        # 3. Button layer
+        button_key = (show_pause_icon, show_setting_icon, scale)
+        if button_key != self._button_key:
+            device_rect = self._device_rect(BUTTON_LAYER_RECT, scale).intersected(canvas_rect)
+            layer, p = self._new_layer(device_rect, scale)
+            p.drawPixmap(QRect(132, 230, BUTTON_SIZE, BUTTON_SIZE), self.icon_pause if show_pause_icon else self.icon_start)
+            p.drawPixmap(QRect(164, 230, BUTTON_SIZE, BUTTON_SIZE), self.icon_reset)
+            if show_setting_icon:
+                p.drawPixmap(QRect(196, 230, BUTTON_SIZE, BUTTON_SIZE), self.icon_setting)
+            p.end()
+            self._button_layer = (device_rect, layer)
+            self._button_key = button_key
+            dirty = dirty.united(device_rect)
+
+        # 4. Overlay layer
+        overlay_key = (tuple(overlay), scale) if overlay else None
+        if overlay_key != self._overlay_key:
+            device_rect = self._device_rect(OVERLAY_RECT, scale).intersected(canvas_rect)
+            if overlay_key is None:
+                self._overlay_layer = None
+            else:
+                layer, p = self._new_layer(device_rect, scale)
+                self._draw_overlay(p, overlay)
+                p.end()
+                self._overlay_layer = (device_rect, layer)
+            self._overlay_key = overlay_key
+            # Also covers the area a removed overlay leaves behind
+            dirty = dirty.united(device_rect)
+
+        # Blit the cached layers into the dirty area only
+        if not dirty.isEmpty():
+            p = QPainter(self._canvas)
+            p.setClipRect(dirty)
+            p.setCompositionMode(QPainter.CompositionMode_Source)
+            p.fillRect(dirty, Qt.transparent)
+            p.drawPixmap(dirty.topLeft(), self._skin_layer, dirty)
+            p.setCompositionMode(QPainter.CompositionMode_SourceOver)
+            layers = (self._text_layer, self._button_layer, self._overlay_layer)
+            for device_rect, layer in (entry for entry in layers if entry is not None):
+                if device_rect.intersects(dirty):
+                    p.drawPixmap(device_rect.topLeft(), layer)
+            p.end()
+        self.dirty_rect = dirty
+        return self._canvas
+
+    def _draw_overlay(self, p, lines):
+        font = self._sized_fonts.get(OVERLAY_FONT_SIZE)
+        if font is None:
+            font = QFont(self.font)
+            font.setPixelSize(OVERLAY_FONT_SIZE)
+            self._sized_fonts[OVERLAY_FONT_SIZE] = font
+        p.fillRect(OVERLAY_RECT, QColor(0, 0, 0, 160))
+        p.setFont(font)
+        p.setPen(QColor(0, 255, 0))
+        # Minecraftia reports a huge line height, so place baselines by hand
+        for i, line in enumerate(lines[:OVERLAY_RECT.height() // OVERLAY_LINE_HEIGHT]):
+            p.drawText(OVERLAY_RECT.x() + 2, OVERLAY_RECT.y() + (i + 1) * OVERLAY_LINE_HEIGHT, line)
+
+    def _font_for(self, text):
         # Auto-scale text to fit
         max_w = 256 - 53 - 5
-        fm = QFontMetrics(self.font)
-        w_text = fm.horizontalAdvance(text)
-        current_font = self.font
+        if GlyphAtlas.supports(text):
+            w_text = sum(self._base_advances[ch] for ch in text)
+        else:
+            w_text = QFontMetrics(self.font).horizontalAdvance(text)
+        size = BASE_FONT_SIZE
         if w_text > max_w:
             factor = max_w / w_text
-            new_size = int(48 * factor)
-            if new_size < 10: new_size = 10
-            f = QFont(self.font)
-            f.setPixelSize(new_size)
-            current_font = f
-            
+            size = int(BASE_FONT_SIZE * factor)
+            if size < 10: size = 10
+        font = self._sized_fonts.get(size)
+        if font is None:
+            font = QFont(self.font)
+            font.setPixelSize(size)
+            self._sized_fonts[size] = font
+        return size, font
+
+    def _atlas_for(self, size, font, scale, text_color, outline_enabled, outline_color, outline_width):
+        key = (size, scale, text_color.rgba(), outline_enabled, outline_color.rgba() if outline_enabled else None, outline_width if outline_enabled else None)
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            if len(self._atlases) >= MAX_ATLASES:
+                self._atlases.clear()
+            atlas = GlyphAtlas(font, scale, text_color, outline_enabled, outline_color, outline_width)
+            self._atlases[key] = atlas
+        return atlas
+
+    def _draw_text(self, p, text, text_color, outline_enabled, outline_color, outline_width, scale=1, origin=QPoint()):
+        size, current_font = self._font_for(text)
+
+        # Fast path: blit pre-rendered glyph cells at integer device positions
+        if GlyphAtlas.supports(text):
+            atlas = self._atlas_for(size, current_font, scale, text_color, outline_enabled, outline_color, outline_width)
+            p.save()
+            p.resetTransform()
+            x = int(round(TEXT_RECT.x() * scale)) - origin.x()
+            y = int(round(TEXT_RECT.y() * scale)) - origin.y()
+            atlas.draw(p, x, y, text)
+            p.restore()
+            return
+
         p.setFont(current_font)
-        p.scale(scale, scale)
-        p.drawPixmap(0, 0, base_frame)
-        
+
         # Draw Text with Outline if enabled
-        text_rect = QRect(53, 173, 256 - 53, 256 - 173)
+        text_rect = TEXT_RECT
         if outline_enabled:
-            if outline_color is None:
-                outline_color = QColor(0, 0, 0)
             path = QPainterPath()
             # Calculate position manually since drawText uses AlignLeft | AlignTop
             # Default font metric adjustment
@@ -95,7 +260,7 @@ class Renderer:
             x = text_rect.x()
             y = text_rect.y() + fm.ascent()
             path.addText(x, y, current_font, text)
-            
+
             pen = QPen(outline_color, outline_width)
             p.setPen(pen)
             p.setBrush(text_color)
@@ -103,12 +268,3 @@ class Renderer:
         else:
             p.setPen(text_color)
             p.drawText(text_rect, Qt.AlignLeft | Qt.AlignTop, text)
-
-        # Buttons at 24x24
-        btn_size = 24
-        p.drawPixmap(QRect(132, 230, btn_size, btn_size), self.icon_pause if show_pause_icon else self.icon_start)
-        p.drawPixmap(QRect(164, 230, btn_size, btn_size), self.icon_reset)
-        if show_setting_icon:
-            p.drawPixmap(QRect(196, 230, btn_size, btn_size), self.icon_setting)
-        p.end()
-        return canvas
@@ -1,45 +1,271 @@
-import platform
+"""
+End-of-phase sound cue.
+
+The cue is prepared once per customSoundPath and kept in memory by a
+QSoundEffect, so play_end() only triggers an already loaded effect.
+WAV files are loaded directly; other formats (MP3) are decoded once with
+QAudioDecoder into a 16-bit PCM WAV under cache/sounds/, keyed like the
+skin cache by path, mtime and size, so later starts skip the decode as
+well. Without QtMultimedia, WAV cues go through winsound's async
+PlaySound and the beep runs on a worker thread; play_end() never blocks
+the GUI thread.
+"""
+import hashlib
 import os
-from PySide6.QtCore import QUrl, QFileInfo
+import platform
+import struct
+import threading
+import time
+from PySide6.QtCore import QUrl, QTimer
+from services import perf
 try:
     import winsound
 except Exception:
     winsound = None
 
-try:
-    from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
-    HAS_QT_MM = True
-except ImportError:
-    HAS_QT_MM = False
+CACHE_DIR = os.path.join(os.getcwd(), "cache", "sounds")
+SOUND_KEYS = frozenset(("soundEnabled", "customSoundPath"))
+# Preparing the cue loads the media backend; keep it out of the first paint
+PRELOAD_DELAY_MS = 1000
+# Longer files are cut: a cue should be short and its PCM stays in memory
+MAX_CUE_SECONDS = 30
+DECODE_RATE = 44100
+DECODE_CHANNELS = 2
+
+_multimedia = None
+
+
+def _load_multimedia():
+    """Import QtMultimedia on first use; None when it is unavailable."""
+    global _multimedia
+    if _multimedia is None:
+        try:
+            from PySide6 import QtMultimedia
+            _multimedia = QtMultimedia
+        except Exception as e:
+            print(f"QtMultimedia unavailable: {e}")
+            _multimedia = False
+    return _multimedia or None
+
+
+def _file_key(path):
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.normcase(os.path.abspath(path)), st.st_mtime_ns, st.st_size)
+
+
+def _cache_path(key):
+    path_tag = hashlib.sha1(key[0].encode("utf-8")).hexdigest()[:16]
+    content_tag = hashlib.sha1(f"{key[1]}|{key[2]}".encode("utf-8")).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"{path_tag}_{content_tag}.wav")
+
+
+def _write_wav(path, pcm, rate, channels):
+    """Write 16-bit PCM as a WAV file atomically and drop stale decodes of the same source."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + len(pcm), b"WAVE",
+        b"fmt ", 16, 1, channels, rate, rate * channels * 2, channels * 2, 16,
+        b"data", len(pcm),
+    )
+    with open(path + ".tmp", "wb") as f:
+        f.write(header)
+        f.write(pcm)
+    os.replace(path + ".tmp", path)
+    prefix = os.path.basename(path).split("_", 1)[0] + "_"
+    for name in os.listdir(CACHE_DIR):
+        if name.startswith(prefix) and name != os.path.basename(path):
+            try:
+                os.remove(os.path.join(CACHE_DIR, name))
+            except OSError:
+                pass
+
 
 class AudioService:
     def __init__(self, config):
         self.config = config
-        self.player = None
-        self.audio_output = None
-        if HAS_QT_MM:
-            self.player = QMediaPlayer()
-            self.audio_output = QAudioOutput()
-            self.player.setAudioOutput(self.audio_output)
-            self.audio_output.setVolume(1.0)
+        self._effect = None
+        self._effect_source = None
+        self._decoder = None
+        self._pcm = []
+        self._pcm_bytes = 0
+        self._cue_key = None  # file key the effect (or running decode) was built for
+        self._beep_thread = None
+        self._play_requested = None
+        self.last_latency_ms = None  # play_end() to the effect reporting playback
+        changed = getattr(config, "changed", None)
+        if changed is not None:
+            changed.connect(self._on_config_changed)
+        QTimer.singleShot(PRELOAD_DELAY_MS, self.preload)
+
+    def _on_config_changed(self, keys):
+        if keys & SOUND_KEYS:
+            self.preload()
+
+    def preload(self):
+        """Prepare the configured cue; does nothing if it is already prepared for this file."""
+        if not self.config.get("soundEnabled", True):
+            self._release()
+            return
+        key = _file_key(self.config.get("customSoundPath", ""))
+        if key == self._cue_key:
+            return
+        self._release()
+        self._cue_key = key
+        if key is None or not _load_multimedia():
+            return  # beep / winsound fallback
+        cached = _cache_path(key)
+        if key[0].lower().endswith(".wav"):
+            self._load_effect(key[0])
+        elif os.path.exists(cached):
+            self._load_effect(cached)
+        else:
+            self._decode(key[0], cached)
+
+    def _release(self):
+        if self._decoder is not None:
+            self._decoder.stop()
+            self._decoder.deleteLater()
+            self._decoder = None
+        if self._effect is not None:
+            self._effect.stop()
+            self._effect.deleteLater()
+            self._effect = None
+        self._effect_source = None
+        self._pcm = []
+        self._pcm_bytes = 0
+        self._cue_key = None
+
+    # --- preparation ------------------------------------------------------
+
+    def _load_effect(self, path):
+        mm = _load_multimedia()
+        effect = mm.QSoundEffect()
+        effect.statusChanged.connect(self._on_effect_status)
+        effect.playingChanged.connect(self._on_playing_changed)
+        effect.setVolume(1.0)
+        # QSoundEffect reads and decodes the file once, off the GUI thread
+        effect.setSource(QUrl.fromLocalFile(path))
+        self._effect = effect
+        self._effect_source = path
+
+    def _on_effect_status(self):
+        effect = self._effect
+        if effect is None or effect.status() != _load_multimedia().QSoundEffect.Status.Error:
+            return
+        key = self._cue_key
+        if key is not None and self._effect_source == key[0] and key[0].lower().endswith(".wav"):
+            # e.g. a compressed WAV QSoundEffect cannot read: decode it like an MP3
+            effect.deleteLater()
+            self._effect = None
+            self._decode(key[0], _cache_path(key))
+            return
+        print(f"Sound cue unusable: {self._effect_source}")
+        effect.deleteLater()
+        self._effect = None
+
+    def _decode(self, path, cached):
+        mm = _load_multimedia()
+        fmt = mm.QAudioFormat()
+        fmt.setSampleFormat(mm.QAudioFormat.SampleFormat.Int16)
+        fmt.setSampleRate(DECODE_RATE)
+        fmt.setChannelCount(DECODE_CHANNELS)
+        decoder = mm.QAudioDecoder()
+        decoder.setAudioFormat(fmt)
+        decoder.setSource(QUrl.fromLocalFile(path))
+        decoder.bufferReady.connect(self._on_buffer_ready)
+        decoder.finished.connect(lambda: self._on_decoded(decoder, cached))
+        decoder.error.connect(lambda err: self._on_decode_error(decoder))
+        self._decoder = decoder
+        self._pcm = []
+        self._pcm_bytes = 0
+        decoder.start()
+
+    def _on_buffer_ready(self):
+        decoder = self._decoder
+        if decoder is None:
+            return
+        buffer = decoder.read()
+        if not buffer.isValid():
+            return
+        self._pcm.append(bytes(buffer.constData())[:buffer.byteCount()])
+        self._pcm_bytes += buffer.byteCount()
+        if self._pcm_bytes >= MAX_CUE_SECONDS * DECODE_RATE * DECODE_CHANNELS * 2:
+            decoder.stop()
+            self._on_decoded(decoder, _cache_path(self._cue_key))
+
+    def _on_decoded(self, decoder, cached):
+        if decoder is not self._decoder:
+            return  # superseded by a newer sound
+        self._decoder = None
+        decoder.deleteLater()
+        pcm, self._pcm, self._pcm_bytes = b"".join(self._pcm), [], 0
+        if not pcm:
+            print(f"Sound cue decoded to nothing: {self._cue_key[0]}")
+            return
+        try:
+            _write_wav(cached, pcm, DECODE_RATE, DECODE_CHANNELS)
+        except Exception as e:
+            print(f"Sound cache write failed: {e}")
+            return
+        self._load_effect(cached)
+
+    def _on_decode_error(self, decoder):
+        if decoder is not self._decoder:
+            return
+        print(f"Sound cue decode failed: {decoder.errorString()}")
+        self._decoder = None
+        decoder.deleteLater()
+        self._pcm, self._pcm_bytes = [], 0
+
+    # --- playback ---------------------------------------------------------
 
     def play_end(self):
         if not self.config.get("soundEnabled", True):
             return
+        self.preload()  # no-op unless the sound changed or was never prepared
+        effect = self._effect
+        if effect is not None:
+            self._play_requested = time.perf_counter()
+            if effect.isPlaying():
+                effect.stop()
+            effect.play()
+            return
+        self._play_fallback()
 
+    def _on_playing_changed(self):
+        if self._effect is None or not self._effect.isPlaying() or self._play_requested is None:
+            return
+        latency = time.perf_counter() - self._play_requested
+        self._play_requested = None
+        self.last_latency_ms = round(latency * 1000, 3)
+        perf.record("sound_cue", latency)
+
+    def _play_fallback(self):
+        if platform.system() != "Windows" or not winsound:
+            return
         custom_path = self.config.get("customSoundPath", "")
-        if custom_path and os.path.exists(custom_path) and HAS_QT_MM and self.player:
+        if custom_path.lower().endswith(".wav") and os.path.exists(custom_path):
             try:
-                self.player.stop()
-                self.player.setSource(QUrl.fromLocalFile(custom_path))
-                self.player.play()
+                # SND_ASYNC returns immediately; Windows plays it in the background
+                winsound.PlaySound(custom_path, winsound.SND_FILENAME | winsound.SND_ASYNC | winsound.SND_NODEFAULT)
                 return
             except Exception:
                 pass
-        
-        # Fallback to beep
-        if platform.system() == "Windows" and winsound:
-            try:
-                winsound.Beep(800, 300)
-            except Exception:
-                pass
+        # Beep blocks for its duration, so it runs on a worker; overlapping cues are dropped
+        if self._beep_thread is not None and self._beep_thread.is_alive():
+            return
+        self._beep_thread = threading.Thread(target=self._beep, daemon=True)
+        self._beep_thread.start()
+
+    @staticmethod
+    def _beep():
+        try:
+            winsound.Beep(800, 300)
+        except Exception:
+            pass
@@ -1,149 +1,650 @@
 import os
-import zipfile
+import re
+import shutil
 import datetime
+import hashlib
+import io
 import sys
 import json
+import threading
+import time
+import zlib
+from PySide6.QtCore import QObject, QThread, Signal
 from services.config_service import ConfigService
+from skin.loader import validate_skin
 
-class BackupService:
-    def __init__(self, config):
+CHUNK_SIZE = 1024 * 1024
+SNAPSHOT_VERSION = 1
+# Per-entry compression policy: JSON is deflated, everything else
+# (PNG, ICO, audio) is stored as-is
+DEFLATE_EXTENSIONS = (".json", ".jsonl")
+BLOB_SUFFIX = {"store": "", "zlib": ".z"}
+# Timestamped manual backups: snapshot manifests and legacy zip archives
+BACKUP_NAME = re.compile(r"^backup_(\d{8}_\d{6})\.(json|zip)$")
+# Scratch dirs inside skins/: ".import_<skin>_<pid>" while staging an import,
+# ".old_<skin>_<pid>_<ns>" for a skin replaced by one
+STAGING_DIR = re.compile(r"^\.import_.+_(\d+)$")
+RETIRED_DIR = re.compile(r"^\.old_.+_(\d+)_\d+$")
+SHA256_HEX = re.compile(r"^[0-9a-f]{64}$")
+
+
+def _entry_parts(name):
+    """
+    Split an archive entry name into path parts, or None if it could
+    escape the extraction directory (absolute, "..", drive or backslash).
+    """
+    if not isinstance(name, str) or not name or name.startswith("/") or "\\" in name or ":" in name:
+        return None
+    parts = name.split("/")
+    if any(part in ("", ".", "..") for part in parts):
+        return None
+    return parts
+
+
+def plan_retention(names, now, keep_last=10, keep_daily=7, keep_weekly=4):
+    """
+    Return the backup file names to delete.
+
+    Keeps the newest keep_last backups, the newest backup of each of the
+    last keep_daily days and of each of the last keep_weekly ISO weeks.
+    Timestamps are parsed from the names, so no file is opened or stat'ed.
+    Names that do not match BACKUP_NAME are never deleted.
+    """
+    dated = []
+    for name in names:
+        m = BACKUP_NAME.match(name)
+        if not m:
+            continue
+        try:
+            dated.append((datetime.datetime.strptime(m.group(1), "%Y%m%d_%H%M%S"), name))
+        except ValueError:
+            continue
+    dated.sort(reverse=True)
+
+    keep = {name for _, name in dated[:max(0, keep_last)]}
+    first_day = now.date() - datetime.timedelta(days=keep_daily - 1)
+    first_week = (now - datetime.timedelta(weeks=keep_weekly - 1)).date().isocalendar()[:2]
+    days, weeks = set(), set()
+    for ts, name in dated:
+        day = ts.date()
+        if keep_daily > 0 and day >= first_day and day not in days:
+            days.add(day)
+            keep.add(name)
+        week = day.isocalendar()[:2]
+        if keep_weekly > 0 and week >= first_week and week not in weeks:
+            weeks.add(week)
+            keep.add(name)
+    return [name for _, name in dated if name not in keep]
+
+
+def _remove_trees(paths):
+    for path in paths:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+class _BackupJob(QThread):
+    """Writes one snapshot off the GUI thread and copies it to any extra names."""
+    done = Signal(object)  # {kind: path or None}
+
+    def __init__(self, service, filenames, stats_export, skin_dir, config_export=None):
+        super().__init__()
+        self.service = service
+        self.filenames = filenames
+        self.stats_export = stats_export
+        self.skin_dir = skin_dir
+        self.config_export = config_export
+
+    def run(self):
+        results = {kind: None for kind in self.filenames}
+        kinds = list(self.filenames)
+        path = self.service._create_snapshot(self.filenames[kinds[0]], self.stats_export, self.skin_dir, self.config_export)
+        if path:
+            results[kinds[0]] = path
+            # Coalesced requests share the snapshot instead of re-hashing it
+            for kind in kinds[1:]:
+                results[kind] = self.service._copy_atomic(path, self.filenames[kind])
+        if path:
+            # Still on the worker, so jobs never overlap with pruning
+            self.service.prune_backups()
+        self.done.emit(results)
+
+
+class _ImportJob(QThread):
+    """Extracts and validates a backup off the GUI thread."""
+    progress = Signal(int, int)
+    done = Signal(bool, object)  # ok, staged dict or error message
+
+    def __init__(self, service, path):
+        super().__init__()
+        self.service = service
+        self.path = path
+
+    def run(self):
+        ok, staged = self.service._stage_import(self.path, self.progress.emit)
+        self.done.emit(ok, staged)
+
+
+class BackupService(QObject):
+    """
+    Content-addressed backups.
+
+    Every backed-up file is hashed (SHA-256) and stored once under
+    backups/objects/<2 hex>/<hash>; a snapshot is a small JSON manifest in
+    backups/ mapping archive names to blob hashes. Unchanged skin files are
+    recognised by path, mtime and size via objects/index.json without
+    being re-read, so a backup costs only what changed. Legacy .zip
+    backups can still be imported.
+    """
+    # kind ("manual" or "auto"), snapshot path or None on failure
+    backup_finished = Signal(str, object)
+    import_progress = Signal(int, int)
+    import_finished = Signal(bool, str)
+    # old path, new path of a skin directory moved aside by an import
+    skin_dir_moved = Signal(str, str)
+
+    def __init__(self, config, stats=None):
+        super().__init__()
         self.config = config
+        self.stats = stats
         self.root_dir = os.getcwd()
         self.backup_dir = os.path.join(self.root_dir, "backups")
+        self.objects_dir = os.path.join(self.backup_dir, "objects")
+        self._job = None
+        self._pending = set()
+        self._import_job = None
+        self._retired_skins = []  # replaced skin dirs, deleted by release_retired_skins()
+        self._cleanup = []  # rmtree threads; wait() joins them
+        self.last_report = None  # counters of the most recent snapshot
         if not os.path.exists(self.backup_dir):
             try:
                 os.makedirs(self.backup_dir)
             except Exception:
                 pass
+        # Left behind by a crash or a quit during or right after an import
+        self._remove_later(self._stale_skin_dirs())
 
     def manual_backup(self):
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"backup_{timestamp}.zip"
-        return self._create_zip(filename)
+        """Queue a timestamped backup; the result arrives via backup_finished."""
+        self._request("manual")
 
     def auto_backup(self):
         if self.is_auto_backup_enabled():
-            return self._create_zip("auto_backup.zip")
+            self._request("auto")
 
-    def _create_zip(self, filename):
+    def is_busy(self):
+        return self._job is not None
+
+    def wait(self):
+        """Block until the running backup or import (if any) has finished, e.g. on quit."""
+        if self._job is not None:
+            self._job.wait()
+        if self._import_job is not None:
+            self._import_job.wait()
+        while self._cleanup:
+            self._cleanup.pop().join()
+
+    def _request(self, kind):
+        # Requests arriving while a job runs merge into at most one follow-up job
+        self._pending.add(kind)
+        if self._job is None:
+            self._start_job()
+
+    def _start_job(self):
+        kinds = sorted(self._pending)
+        self._pending = set()
+        filenames = {}
+        for kind in kinds:
+            if kind == "manual":
+                timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+                filenames[kind] = f"backup_{timestamp}.json"
+            else:
+                filenames[kind] = "auto_backup.json"
+        # Stats and config are exported on the GUI thread; the worker only packs bytes.
+        # config.json on disk may still lag behind a debounced save.
+        stats_export = None
+        if self.stats is not None:
+            try:
+                stats_export = self.stats.export_data()
+            except Exception as e:
+                print(f"Stats export failed: {e}")
+        config_export = None
         try:
-            if not os.path.exists(self.backup_dir):
-                os.makedirs(self.backup_dir)
-            
-            zip_path = os.path.join(self.backup_dir, filename)
-            files_to_backup = ["stats.json", "config.json"]
-            
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # 1. Backup stats and config
-                for file in files_to_backup:
-                    file_path = os.path.join(self.root_dir, file)
-                    if os.path.exists(file_path):
-                        zipf.write(file_path, file)
-                
-                # 2. Backup current skin
-                skin_id = self.config.get("skinId", "default")
-                if os.path.isabs(skin_id):
-                    skin_dir = skin_id
-                else:
-                    skin_dir = os.path.join(self.root_dir, "skins", skin_id)
-                
-                if os.path.exists(skin_dir) and os.path.isdir(skin_dir):
-                    skin_base_name = os.path.basename(skin_dir)
-                    for root, dirs, files in os.walk(skin_dir):
-                        for file in files:
-                            # Filter only image files and json metadata to be safe/clean
-                            if file.lower().endswith('.png') or file.lower().endswith('.ico') or file.lower().endswith('.json'):
-                                full_path = os.path.join(root, file)
-                                # Preserve relative structure inside zip under "skin_backup/<skin_name>/"
-                                rel_path = os.path.relpath(full_path, skin_dir)
-                                arcname = os.path.join("skin_backup", skin_base_name, rel_path)
-                                zipf.write(full_path, arcname)
-
-            return zip_path
+            config = self.config.to_dict() if hasattr(self.config, "to_dict") else dict(self.config)
+            config_export = json.dumps(config, ensure_ascii=False, indent=2).encode("utf-8")
+        except Exception as e:
+            print(f"Config export failed: {e}")
+        self._job = _BackupJob(self, filenames, stats_export, self._skin_dir(), config_export)
+        self._job.done.connect(self._on_job_done)
+        self._job.start()
+
+    def _on_job_done(self, results):
+        self._job.wait()
+        self._job = None
+        for kind, path in results.items():
+            self.backup_finished.emit(kind, path)
+        if self._pending:
+            self._start_job()
+
+    def _skin_dir(self):
+        skin_id = self.config.get("skinId", "default")
+        if os.path.isabs(skin_id):
+            return skin_id
+        return os.path.join(self.root_dir, "skins", skin_id)
+
+    def _copy_atomic(self, src, filename):
+        target = os.path.join(self.backup_dir, filename)
+        tmp_path = target + ".tmp"
+        try:
+            shutil.copyfile(src, tmp_path)
+            os.replace(tmp_path, target)
+            return target
+        except Exception as e:
+            print(f"Backup copy failed: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+
+    # --- blob store -------------------------------------------------------
+
+    def _compression_level(self):
+        try:
+            return max(0, min(9, int(self.config.get("backupCompressionLevel", 6))))
+        except (TypeError, ValueError):
+            return 6
+
+    def _codec_for(self, name):
+        # Images and audio are already compressed; deflating them only burns CPU
+        ext = os.path.splitext(name)[1].lower()
+        if ext in DEFLATE_EXTENSIONS and self._compression_level() > 0:
+            return "zlib"
+        return "store"
+
+    def _blob_path(self, digest, codec="store"):
+        return os.path.join(self.objects_dir, digest[:2], digest + BLOB_SUFFIX[codec])
+
+    def _put_bytes(self, name, data: bytes, report):
+        codec = self._codec_for(name)
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest, codec)
+        report["files"] += 1
+        report["bytes_in"] += len(data)
+        if os.path.exists(path):
+            report["reused"] += 1
+        else:
+            payload = zlib.compress(data, self._compression_level()) if codec == "zlib" else data
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+            report["bytes_out"] += len(payload)
+        return {"sha256": digest, "size": len(data), "codec": codec}
+
+    def _put_file(self, name, full_path, index, report):
+        codec = self._codec_for(name)
+        st = os.stat(full_path)
+        key = os.path.abspath(full_path)
+        report["files"] += 1
+        known = index.get(key)
+        if (known and known[:2] == [st.st_mtime_ns, st.st_size]
+                and os.path.exists(self._blob_path(known[2], codec))):
+            report["reused"] += 1
+            return {"sha256": known[2], "size": st.st_size, "codec": codec}
+
+        # Hash (and deflate if the policy says so) while copying into a temp blob
+        os.makedirs(self.objects_dir, exist_ok=True)
+        h = hashlib.sha256()
+        deflate = zlib.compressobj(self._compression_level()) if codec == "zlib" else None
+        tmp_path = os.path.join(self.objects_dir, f"incoming_{os.getpid()}.tmp")
+        written = 0
+        with open(full_path, "rb") as src, open(tmp_path, "wb") as dst:
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                h.update(chunk)
+                report["bytes_in"] += len(chunk)
+                if deflate is not None:
+                    chunk = deflate.compress(chunk)
+                dst.write(chunk)
+                written += len(chunk)
+            if deflate is not None:
+                tail = deflate.flush()
+                dst.write(tail)
+                written += len(tail)
+        digest = h.hexdigest()
+        path = self._blob_path(digest, codec)
+        if os.path.exists(path):
+            os.remove(tmp_path)
+            report["reused"] += 1
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+            report["bytes_out"] += written
+        index[key] = [st.st_mtime_ns, st.st_size, digest]
+        return {"sha256": digest, "size": st.st_size, "codec": codec}
+
+    def _open_blob(self, entry):
+        codec = entry.get("codec", "store")
+        f = open(self._blob_path(entry["sha256"], codec), "rb")
+        if codec == "zlib":
+            # Only small JSON entries are deflated; inflate them in memory
+            with f:
+                return io.BytesIO(zlib.decompress(f.read()))
+        return f
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.objects_dir, "index.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _save_index(self, index):
+        path = os.path.join(self.objects_dir, "index.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(path + ".tmp", path)
+
+    def _create_snapshot(self, filename, stats_export=None, skin_dir=None, config_export=None):
+        """Store changed files as blobs and write the manifest atomically."""
+        try:
+            os.makedirs(self.objects_dir, exist_ok=True)
+            index = self._load_index()
+            files = {}
+            report = {"files": 0, "reused": 0, "bytes_in": 0, "bytes_out": 0}
+            started = time.perf_counter()
+
+            # 1. Backup stats and config
+            files_to_backup = ["stats.json", "sessions.jsonl", "config.json"]
+            if stats_export is not None:
+                # Exported through the service so every stats backend backs up alike
+                data, log_bytes = stats_export
+                files["stats.json"] = self._put_bytes("stats.json", json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8"), report)
+                files["sessions.jsonl"] = self._put_bytes("sessions.jsonl", log_bytes, report)
+                files_to_backup.remove("stats.json")
+                files_to_backup.remove("sessions.jsonl")
+            if config_export is not None:
+                files["config.json"] = self._put_bytes("config.json", config_export, report)
+                files_to_backup.remove("config.json")
+            for file in files_to_backup:
+                file_path = os.path.join(self.root_dir, file)
+                if os.path.exists(file_path):
+                    files[file] = self._put_file(file, file_path, index, report)
+
+            # 2. Backup current skin
+            if skin_dir is None:
+                skin_dir = self._skin_dir()
+            if os.path.exists(skin_dir) and os.path.isdir(skin_dir):
+                skin_base_name = os.path.basename(skin_dir)
+                for root, dirs, names in os.walk(skin_dir):
+                    for file in names:
+                        # Filter only image files and json metadata to be safe/clean
+                        if file.lower().endswith(('.png', '.ico', '.json')):
+                            full_path = os.path.join(root, file)
+                            # Preserve relative structure under "skin_backup/<skin_name>/"
+                            rel_path = os.path.relpath(full_path, skin_dir).replace(os.sep, "/")
+                            arcname = f"skin_backup/{skin_base_name}/{rel_path}"
+                            files[arcname] = self._put_file(arcname, full_path, index, report)
+
+            self._save_index(index)
+            report["seconds"] = round(time.perf_counter() - started, 3)
+            manifest = {
+                "version": SNAPSHOT_VERSION,
+                "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                "report": report,
+                "files": files
+            }
+            path = os.path.join(self.backup_dir, filename)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            os.replace(path + ".tmp", path)
+            self.last_report = report
+            print(f"Backup {filename}: {report['files']} files ({report['reused']} unchanged), "
+                  f"{report['bytes_in']} bytes in, {report['bytes_out']} bytes out, {report['seconds']}s")
+            return path
         except Exception as e:
             print(f"Backup failed: {e}")
             return None
 
-    def import_backup(self, zip_path, stats_service):
+    # --- retention --------------------------------------------------------
+
+    def prune_backups(self, now=None):
+        """Apply the retention policy, then drop blobs no snapshot references."""
         try:
-            if not os.path.exists(zip_path):
+            names = [e.name for e in os.scandir(self.backup_dir) if e.is_file()]
+            doomed = plan_retention(
+                names, now or datetime.datetime.now(),
+                int(self.config.get("backupKeepLast", 10)),
+                int(self.config.get("backupKeepDaily", 7)),
+                int(self.config.get("backupKeepWeekly", 4)),
+            )
+            for name in doomed:
+                try:
+                    os.remove(os.path.join(self.backup_dir, name))
+                except OSError:
+                    pass
+            if any(name.endswith(".json") for name in doomed) and self._import_job is None:
+                self._collect_garbage()
+            return doomed
+        except Exception as e:
+            print(f"Backup pruning failed: {e}")
+            return []
+
+    def _collect_garbage(self):
+        live = set()
+        for entry in os.scandir(self.backup_dir):
+            if entry.is_file() and entry.name.endswith(".json"):
+                with open(entry.path, "r", encoding="utf-8") as f:
+                    files = json.load(f).get("files", {})
+                for e in files.values():
+                    live.add(e["sha256"] + BLOB_SUFFIX[e.get("codec", "store")])
+        if not os.path.isdir(self.objects_dir):
+            return
+        dropped = set()
+        for sub in os.scandir(self.objects_dir):
+            if not sub.is_dir():
+                continue
+            for blob in os.scandir(sub.path):
+                if blob.name not in live and not blob.name.endswith(".tmp"):
+                    os.remove(blob.path)
+                    dropped.add(blob.name.split(".")[0])
+        if dropped:
+            index = self._load_index()
+            self._save_index({k: v for k, v in index.items() if v[2] not in dropped})
+
+    # --- restore ----------------------------------------------------------
+
+    def is_importing(self):
+        return self._import_job is not None
+
+    def import_backup_async(self, path, stats_service):
+        """
+        Stage the backup on a worker thread; the result is applied on the
+        GUI thread and reported through import_finished.
+        """
+        if self._import_job is not None:
+            return False
+        self._import_job = _ImportJob(self, path)
+        self._import_job.progress.connect(self.import_progress)
+        self._import_job.done.connect(lambda ok, staged: self._on_import_staged(ok, staged, stats_service))
+        self._import_job.start()
+        return True
+
+    def _on_import_staged(self, ok, staged, stats_service):
+        self._import_job.wait()
+        self._import_job = None
+        if ok:
+            ok, msg = self._apply_import(staged, stats_service)
+        else:
+            msg = staged
+        self.import_finished.emit(ok, msg)
+
+    def import_backup(self, path, stats_service):
+        """Restore a snapshot manifest (.json) or a legacy .zip backup synchronously."""
+        ok, staged = self._stage_import(path)
+        if not ok:
+            return False, staged
+        return self._apply_import(staged, stats_service)
+
+    def _stage_import(self, path, progress=None):
+        """Read stats/config and extract the skin into a staging directory."""
+        try:
+            if not os.path.exists(path):
                 return False, "文件不存在"
-            
-            with zipfile.ZipFile(zip_path, 'r') as zipf:
-                # 1. Restore stats
-                if "stats.json" not in zipf.namelist():
-                    return False, "备份文件中未找到统计数据"
-                
-                with zipf.open("stats.json") as f:
-                    data = json.load(f)
-                    if not stats_service.import_data(data):
-                        return False, "数据格式错误"
-
-                # 1.1 Restore config (specifically textColor and outline settings)
-                if "config.json" in zipf.namelist():
-                    try:
-                        with zipf.open("config.json") as f:
-                            cfg = json.load(f)
-                            updated = False
-                            if "textColor" in cfg:
-                                self.config["textColor"] = cfg["textColor"]
-                                updated = True
-                            if "textOutlineEnabled" in cfg:
-                                self.config["textOutlineEnabled"] = cfg["textOutlineEnabled"]
-                                updated = True
-                            if "textOutlineColor" in cfg:
-                                self.config["textOutlineColor"] = cfg["textOutlineColor"]
-                                updated = True
-                            if "textOutlineWidth" in cfg:
-                                self.config["textOutlineWidth"] = cfg["textOutlineWidth"]
-                                updated = True
-                                
-                            if updated:
-                                ConfigService.save(self.config)
-                    except Exception:
-                        pass
-
-                # 2. Restore skin if exists
-                skin_files = [f for f in zipf.namelist() if f.startswith("skin_backup/")]
-                if skin_files:
-                    # Extract first folder name under skin_backup
-                    # Structure: skin_backup/<skin_name>/...
-                    first_file = skin_files[0]
-                    parts = first_file.split('/')
-                    if len(parts) >= 2:
-                        skin_name = parts[1]
-                        if skin_name:
-                            target_skin_dir = os.path.join(self.root_dir, "skins", skin_name)
-                            
-                            # Extract files
-                            for file in skin_files:
-                                # Skip directory entries
-                                if file.endswith('/'):
-                                    continue
-                                    
-                                # Reconstruct path: skins/<skin_name>/<filename>
-                                # file is like "skin_backup/<skin_name>/skin_001.png"
-                                # rel_path is "skin_001.png"
-                                rel_path = file.split('/', 2)[-1] 
-                                target_path = os.path.join(target_skin_dir, rel_path)
-                                
-                                target_dir = os.path.dirname(target_path)
-                                if not os.path.exists(target_dir):
-                                    os.makedirs(target_dir)
-                                    
-                                with zipf.open(file) as source, open(target_path, "wb") as target:
-                                    target.write(source.read())
-                            
-                            # Update config to use this skin
-                            self.config["skinId"] = skin_name
-                            ConfigService.save(self.config)
-
-            return True, "导入成功"
+
+            if path.lower().endswith(".json"):
+                with open(path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+                files = manifest.get("files")
+                if not isinstance(files, dict):
+                    return False, "备份清单格式错误"
+                for name, e in files.items():
+                    if (_entry_parts(name) is None or not isinstance(e, dict)
+                            or not SHA256_HEX.match(str(e.get("sha256", "")))
+                            or e.get("codec", "store") not in BLOB_SUFFIX):
+                        return False, f"备份清单条目无效：{name}"
+                missing = [n for n, e in files.items() if not os.path.exists(self._blob_path(e["sha256"], e.get("codec", "store")))]
+                if missing:
+                    return False, f"备份数据缺失：{missing[0]}"
+                return self._stage(list(files), lambda name: self._open_blob(files[name]), progress)
+
+            # Legacy .zip backups only; not worth importing zipfile at startup
+            import zipfile
+            with zipfile.ZipFile(path, 'r') as zipf:
+                return self._stage(zipf.namelist(), zipf.open, progress)
         except json.JSONDecodeError:
             return False, "JSON文件损坏"
         except Exception as e:
             return False, str(e)
 
+    def _stage(self, names, open_entry, progress=None):
+        """Shared staging for both formats; open_entry(name) returns a binary file object."""
+        if "stats.json" not in names:
+            return False, "备份文件中未找到统计数据"
+
+        staged = {"stats": None, "log": None, "config": None, "skin_name": None, "staging": None}
+        with open_entry("stats.json") as f:
+            staged["stats"] = json.load(f)
+        if "sessions.jsonl" in names:
+            with open_entry("sessions.jsonl") as f:
+                staged["log"] = f.read()
+        if "config.json" in names:
+            try:
+                with open_entry("config.json") as f:
+                    staged["config"] = json.load(f)
+            except Exception:
+                pass
+
+        # Structure: skin_backup/<skin_name>/..., directory entries skipped
+        skin_files = [f for f in names if f.startswith("skin_backup/") and not f.endswith('/')]
+        if not skin_files:
+            return True, staged
+        # Entry names come from the archive: refuse anything that could land outside the staging dir
+        skin_parts = [_entry_parts(f) for f in skin_files]
+        if any(p is None or len(p) < 3 for p in skin_parts):
+            return False, "备份文件包含非法路径"
+        skin_name = skin_parts[0][1]
+        if any(p[1] != skin_name for p in skin_parts):
+            return False, "备份文件包含多个皮肤目录"
+
+        skins_dir = os.path.join(self.root_dir, "skins")
+        staging = os.path.abspath(os.path.join(skins_dir, f".import_{skin_name}_{os.getpid()}"))
+        shutil.rmtree(staging, ignore_errors=True)
+        try:
+            for i, (file, parts) in enumerate(zip(skin_files, skin_parts)):
+                # "skin_backup/<skin_name>/skin_001.png" -> "skin_001.png"
+                target_path = os.path.abspath(os.path.join(staging, *parts[2:]))
+                if os.path.commonpath([staging, target_path]) != staging:
+                    raise ValueError(f"非法路径 {file}")
+                os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                # Fixed-size chunks keep memory flat however large the entry is
+                with open_entry(file) as source, open(target_path, "wb") as target:
+                    shutil.copyfileobj(source, target, CHUNK_SIZE)
+                if progress:
+                    progress(i + 1, len(skin_files))
+
+            # Refuse to swap in a skin the loader cannot display
+            validate_skin(staging)
+        except Exception as e:
+            shutil.rmtree(staging, ignore_errors=True)
+            return False, f"皮肤校验失败：{e}"
+
+        staged["skin_name"] = skin_name
+        staged["staging"] = staging
+        return True, staged
+
+    def _apply_import(self, staged, stats_service):
+        """Commit a staged import; runs on the GUI thread and only does cheap work."""
+        # 1. Restore stats
+        if not stats_service.import_data(staged["stats"], staged["log"]):
+            if staged["staging"]:
+                shutil.rmtree(staged["staging"], ignore_errors=True)
+            return False, "数据格式错误"
+
+        # 1.1 Restore config (specifically textColor and outline settings)
+        cfg = staged["config"]
+        if isinstance(cfg, dict):
+            updated = False
+            for key in ("textColor", "textOutlineEnabled", "textOutlineColor", "textOutlineWidth"):
+                if key in cfg:
+                    self.config[key] = cfg[key]
+                    updated = True
+            if updated:
+                ConfigService.save(self.config)
+
+        # 2. Swap the staged skin in with two renames. The old copy stays on
+        # disk until release_retired_skins(): the running skin may still be
+        # decoding frames from it
+        if staged["staging"]:
+            skin_name = staged["skin_name"]
+            target_skin_dir = os.path.join(self.root_dir, "skins", skin_name)
+            old_dir = None
+            try:
+                if os.path.exists(target_skin_dir):
+                    # Unique per import: an earlier retired copy may still be in use
+                    old_dir = os.path.join(self.root_dir, "skins", f".old_{skin_name}_{os.getpid()}_{time.time_ns()}")
+                    os.replace(target_skin_dir, old_dir)
+                os.replace(staged["staging"], target_skin_dir)
+            except Exception as e:
+                if old_dir and os.path.exists(old_dir) and not os.path.exists(target_skin_dir):
+                    os.replace(old_dir, target_skin_dir)
+                shutil.rmtree(staged["staging"], ignore_errors=True)
+                return False, f"皮肤替换失败：{e}"
+            if old_dir:
+                self._retired_skins.append(old_dir)
+                self.skin_dir_moved.emit(target_skin_dir, old_dir)
+
+            # Update config to use this skin
+            self.config["skinId"] = skin_name
+            ConfigService.save(self.config)
+
+        return True, "导入成功"
+
+    def release_retired_skins(self):
+        """Delete skin dirs replaced by imports in the background; call once nothing reads them."""
+        retired, self._retired_skins = self._retired_skins, []
+        self._remove_later(retired)
+
+    def _stale_skin_dirs(self):
+        """Staging and retired dirs in skins/ that belong to no import of this process."""
+        skins_dir = os.path.join(self.root_dir, "skins")
+        try:
+            names = os.listdir(skins_dir)
+        except OSError:
+            return []
+        stale = []
+        for name in names:
+            m = STAGING_DIR.match(name) or RETIRED_DIR.match(name)
+            if m and int(m.group(1)) != os.getpid():
+                stale.append(os.path.join(skins_dir, name))
+        return stale
+
+    def _remove_later(self, paths):
+        if not paths:
+            return
+        self._cleanup = [t for t in self._cleanup if t.is_alive()]
+        t = threading.Thread(target=_remove_trees, args=(list(paths),), daemon=True)
+        t.start()
+        self._cleanup.append(t)
+
     def is_auto_backup_enabled(self):
         return self.config.get("autoBackup", False)
 
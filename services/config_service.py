@@ -1,70 +1,333 @@
+import atexit
 import json
 import os
+import shutil
+import threading
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtGui import QColor
+
+
+TRUE_WORDS = ("true", "1", "yes", "on")
+FALSE_WORDS = ("false", "0", "no", "off")
+
+
+class Field:
+    """One declared config key: type, default and (for numbers) an inclusive range."""
+    __slots__ = ("name", "kind", "default", "lo", "hi")
+
+    def __init__(self, name, kind, default, lo=None, hi=None):
+        self.name = name
+        self.kind = kind
+        self.default = default
+        self.lo = lo
+        self.hi = hi
+
+    def coerce(self, value):
+        try:
+            if self.kind is bool:
+                return self._coerce_bool(value)
+            if self.kind == "color":
+                if not QColor(value).isValid():
+                    return self.default
+                return str(value)
+            value = self.kind(value)
+        except (TypeError, ValueError):
+            return self.default
+        if self.lo is not None and value < self.lo:
+            value = self.lo
+        if self.hi is not None and value > self.hi:
+            value = self.hi
+        return value
+
+    def _coerce_bool(self, value):
+        # Hand-edited files say "false" or 0; anything unrecognised keeps the default
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)) and value in (0, 1):
+            return bool(value)
+        if isinstance(value, str):
+            word = value.strip().lower()
+            if word in TRUE_WORDS:
+                return True
+            if word in FALSE_WORDS:
+                return False
+        return self.default
+
+
+FIELDS = (
+    Field("workMinutes", int, 25, 2, 99),
+    Field("shortBreakMinutes", int, 5, 1, 99),
+    Field("longBreakMinutes", int, 15, 1, 99),
+    Field("sessionsBeforeLongBreak", int, 4, 1, 99),
+    Field("skinId", str, "default"),
+    Field("frameRate", int, 8, 1, 60),
+    Field("frameDuration", int, 100, 100, 1000),
+    Field("uiScale", float, 1.0, 0.5, 3.0),
+    Field("alwaysOnTop", bool, True),
+    Field("soundEnabled", bool, False),
+    Field("manualBreak", bool, False),
+    Field("countUpMode", bool, False),
+    Field("autoBackup", bool, False),
+    Field("backupCompressionLevel", int, 6, 0, 9),
+    Field("backupKeepLast", int, 10, 0, 10000),
+    Field("backupKeepDaily", int, 7, 0, 3650),
+    Field("backupKeepWeekly", int, 4, 0, 520),
+    Field("customSoundPath", str, ""),
+    Field("textColor", "color", "#FFFFFF"),
+    Field("textOutlineEnabled", bool, False),
+    Field("textOutlineColor", "color", "#000000"),
+    Field("textOutlineWidth", int, 2, 0, 16),
+    Field("statsBackend", str, "json"),
+    Field("language", str, "zh-CN"),
+    Field("perfOverlay", bool, False),
+)
+_FIELD_MAP = {f.name: f for f in FIELDS}
+_MISSING = object()
+
+# Change groups: consumers react per group instead of per key
+GROUPS = {
+    "text_style": ("textColor", "textOutlineEnabled", "textOutlineColor", "textOutlineWidth"),
+    "skin": ("skinId",),
+    "timing": ("workMinutes", "shortBreakMinutes", "longBreakMinutes", "sessionsBeforeLongBreak", "countUpMode"),
+    "animation": ("frameDuration", "frameRate"),
+    "scale": ("uiScale",),
+    "diagnostics": ("perfOverlay",),
+}
+
+
+def groups_for(keys):
+    return frozenset(group for group, members in GROUPS.items() if not set(members).isdisjoint(keys))
+
+
+class _ConfigSignals(QObject):
+    changed = Signal(object)  # frozenset of keys whose value changed
+    groups_changed = Signal(object)  # frozenset of GROUPS names touched by that change
+
+
+class Config:
+    """
+    Validated configuration produced by ConfigService.load.
+
+    Declared keys live in slots and are read as attributes
+    (config.countUpMode); colours are also kept pre-parsed as
+    text_qcolor / outline_qcolor. Writes go through item assignment or
+    update(), which coerce the value and emit changed only when something
+    actually differs, followed by groups_changed with the affected GROUPS.
+    The mapping interface (get, [], in, keys, items)
+    is kept so existing dict-style callers work unchanged.
+    """
+    __slots__ = tuple(f.name for f in FIELDS) + ("text_qcolor", "outline_qcolor", "_extra", "_signals")
+
+    def __init__(self, data=None):
+        data = data or {}
+        self._signals = _ConfigSignals()
+        # Unknown keys are carried through untouched so saving never drops them
+        self._extra = {k: v for k, v in data.items() if k not in _FIELD_MAP}
+        for f in FIELDS:
+            setattr(self, f.name, f.coerce(data.get(f.name, f.default)))
+        self.text_qcolor = QColor(self.textColor)
+        self.outline_qcolor = QColor(self.textOutlineColor)
+
+    @property
+    def changed(self):
+        return self._signals.changed
+
+    @property
+    def groups_changed(self):
+        return self._signals.groups_changed
+
+    def update(self, values):
+        """Apply several keys at once; emits changed once and returns the changed keys."""
+        changed = set()
+        for key, value in dict(values).items():
+            f = _FIELD_MAP.get(key)
+            if f is None:
+                if self._extra.get(key, _MISSING) != value:
+                    self._extra[key] = value
+                    changed.add(key)
+                continue
+            value = f.coerce(value)
+            if getattr(self, key) != value:
+                setattr(self, key, value)
+                changed.add(key)
+        if "textColor" in changed:
+            self.text_qcolor = QColor(self.textColor)
+        if "textOutlineColor" in changed:
+            self.outline_qcolor = QColor(self.textOutlineColor)
+        if changed:
+            changed = frozenset(changed)
+            self.changed.emit(changed)
+            groups = groups_for(changed)
+            if groups:
+                self.groups_changed.emit(groups)
+        return changed
+
+    def __setitem__(self, key, value):
+        self.update({key: value})
+
+    def __getitem__(self, key):
+        if key in _FIELD_MAP:
+            return getattr(self, key)
+        return self._extra[key]
+
+    def get(self, key, default=None):
+        if key in _FIELD_MAP:
+            return getattr(self, key)
+        return self._extra.get(key, default)
+
+    def __contains__(self, key):
+        return key in _FIELD_MAP or key in self._extra
+
+    def keys(self):
+        return list(_FIELD_MAP) + list(self._extra)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(_FIELD_MAP) + len(self._extra)
+
+    def items(self):
+        return [(k, self[k]) for k in self.keys()]
+
+    def to_dict(self):
+        return dict(self.items())
+
 
 class ConfigService:
     PATH = os.path.join(os.getcwd(), "config.json")
-    DEFAULTS = {
-        "workMinutes": 25,
-        "shortBreakMinutes": 5,
-        "longBreakMinutes": 15,
-        "sessionsBeforeLongBreak": 4,
-        "skinId": "default",
-        "frameRate": 8,
-        "frameDuration": 100,
-        "uiScale": 1,
-        "alwaysOnTop": True,
-        "soundEnabled": False,
-        "manualBreak": False,
-        "countUpMode": False,
-        "autoBackup": False,
-        "customSoundPath": "",
-        "textColor": "#FFFFFF",
-        "textOutlineEnabled": False,
-        "textOutlineColor": "#000000",
-        "textOutlineWidth": 2,
-        "language": "zh-CN"
-    }
+    # Previous good config.json, rotated in by every successful write
+    LKG_PATH = os.path.join(os.getcwd(), "config.last_good.json")
+    # Saves within this window are coalesced into one write
+    DEBOUNCE_SECONDS = 0.5
+    DEFAULTS = {f.name: f.default for f in FIELDS}
+
+    _lock = threading.Lock()  # guards _pending/_timer only; never held during disk I/O
+    _write_lock = threading.Lock()  # one writer at a time
+    _pending = None
+    _timer = None
+    _taken = 0  # sequence of the last snapshot taken from _pending
+    _written = 0  # sequence of the snapshot on disk
+    _path_good = False  # config.json on disk is known to parse
 
     @classmethod
     def ensure_defaults(cls):
-        if not os.path.exists(cls.PATH):
-            with open(cls.PATH, "w", encoding="utf-8") as f:
-                json.dump(cls.DEFAULTS, f, ensure_ascii=False, indent=2)
+        if not os.path.exists(cls.PATH) and not os.path.exists(cls.LKG_PATH):
+            cls._write(dict(cls.DEFAULTS))
+
+    @classmethod
+    def _read(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"{path} is not a JSON object")
+        return data
 
     @classmethod
     def load(cls):
         try:
-            with open(cls.PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except Exception:
-            data = dict(cls.DEFAULTS)
-        for k, v in cls.DEFAULTS.items():
-            if k not in data:
-                data[k] = v
-        for k in ("workMinutes", "shortBreakMinutes"):
+            data = cls._read(cls.PATH)
+            cls._path_good = True
+        except Exception as e:
+            cls._path_good = False
             try:
-                val = int(data.get(k, cls.DEFAULTS[k]))
+                data = cls._read(cls.LKG_PATH)
+                print(f"Config unreadable ({e}), using last known good copy")
             except Exception:
-                val = cls.DEFAULTS[k]
-            
-            min_val = 2 if k == "workMinutes" else 1
-            if val < min_val:
-                val = min_val
-            if val > 99:
-                val = 99
-            data[k] = val
+                data = dict(cls.DEFAULTS)
+        # Missing keys take their defaults; bad types and out-of-range values are coerced
+        return Config(data)
+
+    @classmethod
+    def save(cls, data, immediate=False):
+        """Queue data for writing; bursts of saves inside DEBOUNCE_SECONDS produce one write."""
+        with cls._lock:
+            cls._pending = data.to_dict() if isinstance(data, Config) else dict(data)
+            if cls._timer is not None:
+                cls._timer.cancel()
+                cls._timer = None
+            if not immediate:
+                cls._timer = threading.Timer(cls.DEBOUNCE_SECONDS, cls.flush)
+                cls._timer.daemon = True
+                cls._timer.start()
+                return
+        cls.flush()
+
+    @classmethod
+    def has_pending(cls):
+        return cls._pending is not None
+
+    @classmethod
+    def flush(cls):
+        """Write any queued config now."""
+        with cls._lock:
+            data, cls._pending = cls._pending, None
+            if cls._timer is not None:
+                cls._timer.cancel()
+                cls._timer = None
+            if data is None:
+                return
+            cls._taken += 1
+            seq = cls._taken
+        # save() on the GUI thread only waits for the swap above, not for the disk
+        with cls._write_lock:
+            if seq < cls._written:
+                return  # a newer snapshot was written meanwhile
+            cls._written = seq
+            cls._write(data)
+
+    @classmethod
+    def _keep_last_good(cls):
+        """Point last_good at the current file (hard link, or a copy) without moving it."""
+        lkg_tmp = cls.LKG_PATH + ".tmp"
         try:
-            fd = int(data.get("frameDuration", cls.DEFAULTS["frameDuration"]))
-        except Exception:
-            fd = cls.DEFAULTS["frameDuration"]
-        if fd < 100:
-            fd = 100
-        if fd > 1000:
-            fd = 1000
-        data["frameDuration"] = fd
-        return data
+            os.remove(lkg_tmp)
+        except OSError:
+            pass
+        try:
+            os.link(cls.PATH, lkg_tmp)
+        except OSError:
+            shutil.copy2(cls.PATH, lkg_tmp)
+        os.replace(lkg_tmp, cls.LKG_PATH)
 
     @classmethod
-    def save(cls, data):
-        with open(cls.PATH, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+    def _write(cls, data):
+        # temp file + fsync + rename: a crash leaves either the old or the new file
+        tmp_path = cls.PATH + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            if cls._path_good and os.path.exists(cls.PATH):
+                cls._keep_last_good()
+            # config.json is never missing: the new file replaces it in one rename
+            os.replace(tmp_path, cls.PATH)
+            cls._path_good = True
+            _fsync_dir(cls.PATH)
+        except Exception as e:
+            print(f"Config save failed: {e}")
+            if os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+
+def _fsync_dir(path):
+    """Make a rename inside path's directory durable (POSIX; a no-op on Windows)."""
+    if os.name != "posix":
+        return
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+atexit.register(ConfigService.flush)
@@ -0,0 +1,233 @@
+"""
+Opt-in timing of the hot paths.
+
+enable() swaps timing wrappers onto the methods listed in HOT_PATHS and
+disable() puts the originals back, so with profiling off the app runs
+exactly its own code: no flag checks, no extra calls. Each probe keeps
+the last RING_SIZE calls (end time, duration) in a ring buffer plus a
+total call counter; snapshot()/dump() turn them into percentiles.
+
+Startup phases are timed separately (startup_begin/startup_mark/
+startup_end) and are always on: a handful of perf_counter calls.
+"""
+import collections
+import datetime
+import functools
+import json
+import os
+import platform
+import sys
+import threading
+import time
+
+RING_SIZE = 1024
+# (module, class, method, probe name)
+HOT_PATHS = (
+    ("ui.main_window", "MainWindow", "_compose", "compose"),
+    ("ui.main_window", "MainWindow", "paintEvent", "paint"),
+    ("services.timer_service", "TimerService", "_on_tick", "tick"),
+    ("services.stats_service", "StatsService", "_save", "stats_save"),
+    ("services.stats_service", "SqliteStatsService", "flush", "stats_save"),
+    ("services.config_service", "ConfigService", "_write", "config_save"),
+    ("services.backup_service", "BackupService", "_create_snapshot", "backup"),
+)
+
+_lock = threading.Lock()
+_probes = {}
+_patched = []  # (owner, attribute, original descriptor)
+_started = None
+_startup = []  # (phase, ms since the previous mark)
+_startup_last = None
+
+
+class Probe:
+    __slots__ = ("name", "count", "samples")
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        # deque.append is atomic, so worker threads (backups) can record too
+        self.samples = collections.deque(maxlen=RING_SIZE)
+
+    def record(self, end, seconds):
+        self.count += 1
+        self.samples.append((end, seconds))
+
+    def recent(self, window):
+        """Durations of the calls that ended within the last `window` seconds."""
+        since = time.perf_counter() - window
+        return [d for end, d in reversed(self.samples) if end >= since] if self.samples else []
+
+
+def _percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def _summary(durations):
+    if not durations:
+        return {"n": 0}
+    values = sorted(durations)
+    return {
+        "n": len(values),
+        "mean_ms": round(sum(values) / len(values) * 1000, 3),
+        "p50_ms": round(_percentile(values, 0.50) * 1000, 3),
+        "p90_ms": round(_percentile(values, 0.90) * 1000, 3),
+        "p99_ms": round(_percentile(values, 0.99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3),
+    }
+
+
+def _timed(func, probe):
+    clock = time.perf_counter
+
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        t0 = clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            t1 = clock()
+            probe.record(t1, t1 - t0)
+
+    return timed
+
+
+def enabled():
+    return _started is not None
+
+
+def enable():
+    """
+    Install the timing wrappers. Only modules already imported are
+    instrumented, so profiling never pulls in a lazily loaded subsystem;
+    call enable() again after such an import to cover it as well.
+    """
+    global _started
+    with _lock:
+        if _started is None:
+            _started = time.time()
+        done = {(owner, attr) for owner, attr, _ in _patched}
+        for module_name, class_name, attr, name in HOT_PATHS:
+            module = sys.modules.get(module_name)
+            owner = getattr(module, class_name, None)
+            if owner is None or (owner, attr) in done:
+                continue
+            raw = owner.__dict__.get(attr)
+            if raw is None:
+                continue
+            probe = _probes.setdefault(name, Probe(name))
+            if isinstance(raw, classmethod):
+                wrapped = classmethod(_timed(raw.__func__, probe))
+            elif isinstance(raw, staticmethod):
+                wrapped = staticmethod(_timed(raw.__func__, probe))
+            else:
+                wrapped = _timed(raw, probe)
+            setattr(owner, attr, wrapped)
+            _patched.append((owner, attr, raw))
+
+
+def disable():
+    """Restore the original methods; recorded samples are kept for dump()."""
+    global _started
+    with _lock:
+        _started = None
+        while _patched:
+            owner, attr, raw = _patched.pop()
+            setattr(owner, attr, raw)
+
+
+def record(name, seconds):
+    """Record a duration measured by the caller; ignored while profiling is off."""
+    if _started is None:
+        return
+    _probes.setdefault(name, Probe(name)).record(time.perf_counter(), seconds)
+
+
+def probe(name):
+    return _probes.get(name)
+
+
+def recent_summary(name, window=1.0):
+    p = _probes.get(name)
+    return _summary(p.recent(window) if p else [])
+
+
+def fps(window=1.0):
+    """Frames painted per second over the last window."""
+    p = _probes.get("paint")
+    return len(p.recent(window)) / window if p else 0.0
+
+
+def overlay_lines(pending_writes=0):
+    """Short text lines for the on-screen overlay."""
+    compose = recent_summary("compose")
+    compose_ms = compose.get("mean_ms", 0.0)
+    return (
+        f"CMP {compose_ms:.2f}MS",
+        f"FPS {fps():.0f}",
+        f"WR {pending_writes}",
+    )
+
+
+def startup_begin(t0):
+    """Start the startup report at perf_counter() value t0 (process start)."""
+    global _startup_last
+    _startup.clear()
+    _startup_last = t0
+
+
+def startup_mark(phase):
+    """Close the running startup phase; a no-op outside app startup (tests, bench)."""
+    global _startup_last
+    if _startup_last is None:
+        return
+    now = time.perf_counter()
+    _startup.append((phase, round((now - _startup_last) * 1000, 1)))
+    _startup_last = now
+
+
+def startup_end(phase):
+    global _startup_last
+    startup_mark(phase)
+    _startup_last = None
+    report = startup_report()
+    print("Startup: " + ", ".join(f"{name} {ms}ms" for name, ms in _startup) + f" = {report['total_ms']}ms")
+    return report
+
+
+def startup_report():
+    return {"phases": dict(_startup), "total_ms": round(sum(ms for _, ms in _startup), 1)}
+
+
+def snapshot(extra=None):
+    probes = {}
+    for name, p in sorted(_probes.items()):
+        entry = {"calls": p.count}
+        entry.update(_summary([d for _, d in p.samples]))
+        probes[name] = entry
+    data = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "enabled": enabled(),
+        "enabled_since": datetime.datetime.fromtimestamp(_started).isoformat(timespec="seconds") if _started else None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "frozen": bool(getattr(sys, "frozen", False)),
+        "ring_size": RING_SIZE,
+        "fps": round(fps(), 1),
+        "startup": startup_report(),
+        "probes": probes,
+    }
+    if extra:
+        data.update(extra)
+    return data
+
+
+def dump(directory, extra=None):
+    """Write snapshot() to <directory>/profile_<timestamp>.json and return the path."""
+    os.makedirs(directory, exist_ok=True)
+    name = "profile_" + datetime.datetime.now().strftime("%Y%m%d_%H%M%S") + ".json"
+    path = os.path.join(directory, name)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(snapshot(extra), f, ensure_ascii=False, indent=2)
+    os.replace(path + ".tmp", path)
+    return path
@@ -0,0 +1,312 @@
+"""
+Soak test for TimerService and StatsService on a virtual clock.
+
+    python -m services.soak [--days 14] [--seed 1] [--backend json|sqlite] [--out soak.json]
+
+Replays randomized working days (start, pause, resume, skip, reset and
+idle gaps, with jittered and occasionally stalled ticks) against an
+injected clock and a ManualTicks tick source, so weeks of Pomodoro
+cycles run in seconds. An independent model of the elapsed time checks
+every displayed value, every logged session and every phase transition;
+the report also carries per-tick overhead and stats write counts.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+from PySide6.QtCore import QCoreApplication
+
+from services.config_service import Config
+from services.stats_service import StatsService, SqliteStatsService, MIN_SESSION_SECONDS
+from services.timer_service import TimerService, ManualTicks
+
+DAY_START_HOUR = 9
+DAY_END_HOUR = 18
+MAX_ERRORS = 20
+
+
+class VirtualClock:
+    """Monotonic and wall time that only move when advance() is called."""
+
+    def __init__(self, wall_start):
+        self.mono = 0.0
+        self.wall_start = wall_start
+
+    def __call__(self):
+        return self.mono
+
+    def wall(self):
+        return self.wall_start + self.mono
+
+    def now(self):
+        return datetime.fromtimestamp(self.wall())
+
+    def advance(self, seconds):
+        self.mono += seconds
+
+
+def _counting(base, work):
+    """Subclass of a stats backend that counts its disk writes, stored under work."""
+
+    class CountingStats(base):
+        snapshot_writes = 0
+        log_appends = 0
+        commits = 0  # SQLite transactions; every write of that backend is one
+
+        if base is SqliteStatsService:
+            def __init__(self, clock=None):
+                # The one-time migration reads legacy files from work, never from the app dir
+                super().__init__(clock, os.path.join(work, "stats.json"), os.path.join(work, "sessions.jsonl"))
+                self.conn.set_trace_callback(self._on_statement)
+
+            def _on_statement(self, sql):
+                if sql == "COMMIT":
+                    self.commits += 1
+
+        def _save(self):
+            self.snapshot_writes += 1
+            super()._save()
+
+        def record_session(self, *args, **kwargs):
+            self.log_appends += 1
+            super().record_session(*args, **kwargs)
+
+    if base is SqliteStatsService:
+        CountingStats.PATH = os.path.join(work, "stats.db")
+    else:
+        CountingStats.PATH = os.path.join(work, "stats.json")
+        CountingStats.LOG_PATH = os.path.join(work, "sessions.jsonl")
+    return CountingStats
+
+
+class Soak:
+    def __init__(self, days=14, seed=1, backend="json", config=None):
+        self.days = days
+        self.rng = random.Random(seed)
+        self.work = tempfile.mkdtemp(prefix="bitomato_soak_")
+        start = datetime.now().replace(hour=DAY_START_HOUR, minute=0, second=0, microsecond=0)
+        self.clock = VirtualClock(start.timestamp())
+        self.config = Config(config or {})
+        stats_cls = _counting(SqliteStatsService if backend == "sqlite" else StatsService, self.work)
+        self.stats = stats_cls(clock=self.clock.now)
+        self.ticks = ManualTicks()
+        self.timer = TimerService(self.config, self.stats, clock=self.clock, wall_clock=self.clock.wall, tick_source=self.ticks)
+
+        # Independent model of the phase clock
+        self.model_elapsed = 0.0
+        self.model_running = False
+        self.counted = 0
+        self.records = []
+        self.errors = []
+        self.tick_costs = []
+        self.max_drift = 0.0
+        self.transitions = 0
+        self._expected_next = None
+        self.actions = {"start": 0, "pause": 0, "skip": 0, "reset": 0}
+
+        self.timer.ticked.connect(self._on_ticked)
+        self.timer.phase_changed.connect(self._on_phase_changed)
+        self.timer.completed.connect(self._on_completed)
+        original_record = self.stats.record_session
+
+        def record_session(start, end, duration, phase="WORK", outcome="completed"):
+            self._check_record(duration, phase)
+            original_record(start, end, duration, phase, outcome)
+
+        self.stats.record_session = record_session
+
+    # --- model checks -----------------------------------------------------
+
+    def _error(self, msg):
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(f"{self.clock.now():%Y-%m-%d %H:%M:%S} {msg}")
+
+    def _expected_elapsed(self):
+        return min(self.model_elapsed, self.timer._phase_seconds)
+
+    def _on_ticked(self, mm, ss):
+        expected = divmod(int(math.ceil(self.timer._phase_seconds - self._expected_elapsed())), 60)
+        if (mm, ss) != expected:
+            self._error(f"display {mm:02d}:{ss:02d} != model {expected[0]:02d}:{expected[1]:02d}")
+
+    def _on_phase_changed(self, phase):
+        self.model_elapsed = 0.0
+
+    def _check_record(self, duration, phase):
+        expected = int(self._expected_elapsed())
+        if duration != expected:
+            self._error(f"logged {duration}s != model {expected}s")
+        if phase == "WORK" and duration >= MIN_SESSION_SECONDS:
+            self.counted += 1
+        self.records.append(duration)
+
+    def _on_completed(self):
+        self.model_running = False
+        self.transitions += 1
+        if self.timer.phase == "WORK":
+            n = self.config.sessionsBeforeLongBreak
+            self._expected_next = "LONG_BREAK" if self.counted > 0 and self.counted % n == 0 else "SHORT_BREAK"
+        else:
+            self._expected_next = "WORK"
+        # What MainWindow does on completion
+        self.stats.flush()
+
+    def _check_transition(self):
+        # pending_next_phase is only set once the completing tick has returned
+        if self._expected_next and self.timer.pending_next_phase != self._expected_next:
+            self._error(f"next phase {self.timer.pending_next_phase} != {self._expected_next}")
+        self._expected_next = None
+
+    # --- driving ----------------------------------------------------------
+
+    def _advance(self, seconds):
+        if seconds <= 0:
+            return
+        self.clock.advance(seconds)
+        if self.model_running:
+            self.model_elapsed += seconds
+            self.max_drift = max(self.max_drift, abs(self.timer.elapsed() - self.model_elapsed))
+
+    def _tick_delay(self):
+        delay = self.ticks.pending / 1000.0 + self.rng.uniform(0.0, 0.03)
+        if self.rng.random() < 0.002:
+            delay += self.rng.uniform(1.0, 8.0)  # event loop stall
+        return delay
+
+    def _fire(self):
+        t0 = time.perf_counter()
+        self.ticks.fire()
+        self.tick_costs.append(time.perf_counter() - t0)
+        self._check_transition()
+
+    def _act(self, action):
+        self.actions[action] += 1
+        if action == "start":
+            self.timer.start()
+            self.model_running = True
+        elif action == "pause":
+            self.timer.pause()
+            self.model_running = False
+        elif action == "skip":
+            self.timer.skip()
+        else:
+            self.timer.reset()
+            self.model_running = False
+
+    def _next_action(self):
+        """Pick the next user action and the seconds until it happens."""
+        if not self.timer.running:
+            # Idle gap before (re)starting: short after a completion, longer after a pause
+            return "start", self.rng.uniform(5, 600)
+        roll = self.rng.random()
+        if roll < 0.6:
+            return None, 0  # let the phase run to completion
+        if roll < 0.8:
+            return "pause", self.rng.uniform(30, 900)
+        if roll < 0.9:
+            return "skip", self.rng.uniform(30, 1500)
+        return "reset", self.rng.uniform(30, 1500)
+
+    def run_day(self):
+        day_end = self.clock.mono + (DAY_END_HOUR - DAY_START_HOUR) * 3600
+        while self.clock.mono < day_end:
+            action, wait = self._next_action()
+            deadline = self.clock.mono + wait if action else day_end
+            while self.timer.running and self.ticks.isActive():
+                delay = self._tick_delay()
+                if self.clock.mono + delay > deadline:
+                    break
+                self._advance(delay)
+                self._fire()
+            if not action:
+                if self.timer.running:
+                    # Day ended mid-phase
+                    self._advance(max(0.0, day_end - self.clock.mono))
+                continue
+            self._advance(max(0.0, deadline - self.clock.mono))
+            self._act(action)
+        if self.timer.running:
+            self._act("reset")
+        # Jump overnight to the next morning
+        self._advance(24 * 3600 - (DAY_END_HOUR - DAY_START_HOUR) * 3600 + (self.clock.mono - day_end))
+
+    def run(self):
+        started = time.perf_counter()
+        try:
+            for _ in range(self.days):
+                self.run_day()
+            self.stats.flush()
+            return self.report(time.perf_counter() - started)
+        finally:
+            close = getattr(self.stats, "close", None)
+            if close:
+                close()
+            shutil.rmtree(self.work, ignore_errors=True)
+
+    def _disk_writes(self):
+        if isinstance(self.stats, SqliteStatsService):
+            return self.stats.commits
+        return self.stats.snapshot_writes + self.stats.log_appends
+
+    def report(self, real_seconds):
+        summary = self.stats.get_summary()
+        counted_seconds = sum(d for d in self.records if d >= MIN_SESSION_SECONDS)
+        if summary["total_focus_sessions"] != self.counted:
+            self._error(f"stats sessions {summary['total_focus_sessions']} != model {self.counted}")
+        if summary["total_focus_seconds"] != counted_seconds:
+            self._error(f"stats seconds {summary['total_focus_seconds']} != model {counted_seconds}")
+        if self.timer.sessions_completed != self.counted:
+            self._error(f"sessions_completed {self.timer.sessions_completed} != model {self.counted}")
+        costs = sorted(self.tick_costs) or [0.0]
+        return {
+            "days": self.days,
+            "simulated_hours": round(self.clock.mono / 3600, 1),
+            "real_seconds": round(real_seconds, 2),
+            "ticks": len(self.tick_costs),
+            "tick_us_p50": round(costs[len(costs) // 2] * 1e6, 1),
+            "tick_us_p99": round(costs[int(len(costs) * 0.99)] * 1e6, 1),
+            "tick_us_mean": round(statistics.fmean(costs) * 1e6, 1),
+            "max_drift_ms": round(self.max_drift * 1000, 3),
+            "phase_completions": self.transitions,
+            "actions": self.actions,
+            "sessions_logged": len(self.records),
+            "sessions_counted": self.counted,
+            "stats_snapshot_writes": self.stats.snapshot_writes,
+            "stats_log_appends": self.stats.log_appends,
+            "stats_commits": self.stats.commits,
+            "writes_per_day": round(self._disk_writes() / max(1, self.days), 1),
+            "errors": self.errors,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay weeks of timer usage on a virtual clock")
+    parser.add_argument("--days", type=int, default=14, help="simulated working days (default: 14)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the action script")
+    parser.add_argument("--backend", choices=("json", "sqlite"), default="json", help="stats backend")
+    parser.add_argument("--out", default=None, help="write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    report = Soak(args.days, args.seed, args.backend).run()
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
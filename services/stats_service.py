@@ -1,25 +1,146 @@
 import json
 import os
-from datetime import datetime
+import sqlite3
+from datetime import datetime, timedelta
 
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
 
-class StatsService:
-    PATH = os.path.join(ROOT, "stats.json")
+# Sessions shorter than this are logged but not counted in the totals
+MIN_SESSION_SECONDS = 120
+
+
+def _empty_data():
+    return {
+        "total_focus_seconds": 0,
+        "total_focus_sessions": 0,
+        "bucket_seconds": {
+            "midnight": 0,   # 00:00-06:00
+            "morning": 0,    # 06:00-12:00
+            "afternoon": 0,  # 12:00-18:00
+            "evening": 0     # 18:00-24:00
+        },
+        "log_offset": 0
+    }
+
+
+def _bucket_for(dt: datetime):
+    h = dt.hour
+    if 0 <= h < 6:
+        return "midnight"
+    elif 6 <= h < 12:
+        return "morning"
+    elif 12 <= h < 18:
+        return "afternoon"
+    return "evening"
+
+
+def day_range(when: datetime | None = None):
+    start = (when or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    return start, start + timedelta(days=1)
+
+
+def week_range(when: datetime | None = None):
+    start, _ = day_range(when)
+    start -= timedelta(days=start.weekday())  # weeks start on Monday
+    return start, start + timedelta(days=7)
 
-    def __init__(self):
-        self.data = {
-            "total_focus_seconds": 0,
-            "total_focus_sessions": 0,
-            "bucket_seconds": {
-                "midnight": 0,   # 00:00-06:00
-                "morning": 0,    # 06:00-12:00
-                "afternoon": 0,  # 12:00-18:00
-                "evening": 0     # 18:00-24:00
-            }
+
+def month_range(when: datetime | None = None):
+    start, _ = day_range(when)
+    start = start.replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1)
+    return start, end
+
+
+RANGES = {"day": day_range, "week": week_range, "month": month_range}
+
+
+class _StatsQueries:
+    """Summary and period queries shared by the JSON and SQLite backends."""
+    # Wall clock returning a datetime; injectable so soak runs can replay weeks quickly
+    _clock = datetime.now
+
+    def get_summary(self):
+        seconds = int(self.data.get("total_focus_seconds", 0))
+        sessions = int(self.data.get("total_focus_sessions", 0))
+        buckets = dict(self.data.get("bucket_seconds", {}))
+        favorites = []
+        if seconds > 0 and sessions > 5:
+            for key in ("midnight", "morning", "afternoon", "evening"):
+                share = buckets.get(key, 0) / seconds
+                if share > 0.5:
+                    favorites.append(key)
+        return {
+            "total_focus_seconds": seconds,
+            "total_focus_sessions": sessions,
+            "bucket_seconds": buckets,
+            "favorite_slots": favorites
         }
+
+    def sessions_between(self, start: datetime, end: datetime):
+        """Logged sessions that started in [start, end); backends with an index override this."""
+        lo, hi = start.timestamp(), end.timestamp()
+        return [r for r in self.iter_sessions() if lo <= r.get("start", 0) < hi]
+
+    def summary_between(self, start: datetime, end: datetime):
+        """Counted focus time and sessions that started in [start, end)."""
+        seconds = 0
+        sessions = 0
+        for record in self.sessions_between(start, end):
+            if record.get("counted"):
+                seconds += int(record.get("duration", 0))
+                sessions += 1
+        return {"focus_seconds": seconds, "focus_sessions": sessions}
+
+    def summary_for(self, period: str, when: datetime | None = None):
+        """period is one of "day", "week", "month"."""
+        start, end = RANGES[period](when or self._clock())
+        return self.summary_between(start, end)
+
+    def summaries_for(self, periods=("day", "week", "month"), when: datetime | None = None):
+        """summary_for() of several periods from a single pass over the sessions they span."""
+        when = when or self._clock()
+        ranges = {p: tuple(t.timestamp() for t in RANGES[p](when)) for p in periods}
+        result = {p: {"focus_seconds": 0, "focus_sessions": 0} for p in periods}
+        if not ranges:
+            return result
+        lo = min(r[0] for r in ranges.values())
+        hi = max(r[1] for r in ranges.values())
+        for record in self.sessions_between(datetime.fromtimestamp(lo), datetime.fromtimestamp(hi)):
+            if not record.get("counted"):
+                continue
+            started = record.get("start", 0)
+            for period, (start, end) in ranges.items():
+                if start <= started < end:
+                    result[period]["focus_seconds"] += int(record.get("duration", 0))
+                    result[period]["focus_sessions"] += 1
+        return result
+
+
+class StatsService(_StatsQueries):
+    """
+    Focus statistics backed by an append-only session log.
+
+    sessions.jsonl holds one JSON record per finalized work session
+    (start, end, duration, phase, outcome, counted). stats.json is an
+    aggregate snapshot plus the log byte offset it covers; on load, only
+    records past that offset are replayed, so both appends and startup
+    stay independent of history size.
+    """
+    PATH = os.path.join(ROOT, "stats.json")
+    LOG_PATH = os.path.join(ROOT, "sessions.jsonl")
+
+    def __init__(self, clock=None, path=None, log_path=None):
+        if clock is not None:
+            self._clock = clock
+        if path is not None:
+            self.PATH = path
+        if log_path is not None:
+            self.LOG_PATH = log_path
+        self.data = _empty_data()
         self._load()
         self._unsaved_seconds = 0
+        self._dirty = False
 
     def _load(self):
         if os.path.exists(self.PATH):
@@ -28,30 +149,102 @@ class StatsService:
                     self.data = json.load(f)
             except Exception:
                 pass
+        self.data.setdefault("log_offset", 0)
+        if self._replay_log():
+            self._save()
+
+    def _replay_log(self):
+        """Fold log records written after the last snapshot into the aggregates."""
+        offset = int(self.data.get("log_offset", 0))
+        try:
+            size = os.path.getsize(self.LOG_PATH)
+        except OSError:
+            size = 0
+        if size <= offset:
+            self.data["log_offset"] = size
+            return False
+        replayed = False
+        with open(self.LOG_PATH, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partial trailing write; picked up next time
+                offset += len(line)
+                try:
+                    self._apply(json.loads(line))
+                    replayed = True
+                except Exception:
+                    pass
+        self.data["log_offset"] = offset
+        return replayed
+
+    def _apply(self, record):
+        if not record.get("counted"):
+            return
+        seconds = int(record.get("duration", 0))
+        self.data["total_focus_seconds"] += seconds
+        self.data["total_focus_sessions"] += 1
+        key = _bucket_for(datetime.fromtimestamp(record["end"]))
+        self.data["bucket_seconds"][key] += seconds
 
     def _save(self):
         try:
             with open(self.PATH, "w", encoding="utf-8") as f:
                 json.dump(self.data, f, ensure_ascii=False, indent=2)
+            self._dirty = False
         except Exception:
             pass
 
+    def record_session(self, start: float, end: float, duration: int, phase="WORK", outcome="completed"):
+        """
+        Append one finalized session to the log (a single small write) and
+        update the in-memory aggregates. The snapshot is written on flush().
+        """
+        record = {
+            "start": round(start, 3),
+            "end": round(end, 3),
+            "duration": int(duration),
+            "phase": phase,
+            "outcome": outcome,
+            "counted": phase == "WORK" and duration >= MIN_SESSION_SECONDS
+        }
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        try:
+            with open(self.LOG_PATH, "ab") as f:
+                f.write(line)
+        except Exception:
+            return
+        self._apply(record)
+        self.data["log_offset"] = int(self.data.get("log_offset", 0)) + len(line)
+        self._dirty = True
+
+    def iter_sessions(self):
+        """Yield every logged session record, oldest first."""
+        if not os.path.exists(self.LOG_PATH):
+            return
+        with open(self.LOG_PATH, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except Exception:
+                    continue
+
+    def export_data(self):
+        """Snapshot dict and raw session log, as written into backups."""
+        self.flush()
+        log_bytes = b""
+        if os.path.exists(self.LOG_PATH):
+            with open(self.LOG_PATH, "rb") as f:
+                log_bytes = f.read()
+        return dict(self.data), log_bytes
+
     def add_work_seconds(self, seconds: int, now: datetime | None = None):
         if seconds <= 0:
             return
         self.data["total_focus_seconds"] += seconds
         self._unsaved_seconds += seconds
-        dt = now or datetime.now()
-        h = dt.hour
-        if 0 <= h < 6:
-            key = "midnight"
-        elif 6 <= h < 12:
-            key = "morning"
-        elif 12 <= h < 18:
-            key = "afternoon"
-        else:
-            key = "evening"
-        self.data["bucket_seconds"][key] += seconds
+        dt = now or self._clock()
+        self.data["bucket_seconds"][_bucket_for(dt)] += seconds
         if self._unsaved_seconds >= 60:
             self._save()
             self._unsaved_seconds = 0
@@ -60,57 +253,248 @@ class StatsService:
         self.data["total_focus_sessions"] += 1
         self._save()
 
-    def get_summary(self):
-        seconds = int(self.data.get("total_focus_seconds", 0))
-        sessions = int(self.data.get("total_focus_sessions", 0))
-        buckets = dict(self.data.get("bucket_seconds", {}))
-        favorites = []
-        if seconds > 0 and sessions > 5:
-            for key in ("midnight", "morning", "afternoon", "evening"):
-                share = buckets.get(key, 0) / seconds
-                if share > 0.5:
-                    favorites.append(key)
-        return {
-            "total_focus_seconds": seconds,
-            "total_focus_sessions": sessions,
-            "bucket_seconds": buckets,
-            "favorite_slots": favorites
-        }
+    def has_pending(self):
+        """True while aggregates exist only in memory and wait for flush()."""
+        return self._unsaved_seconds > 0 or self._dirty
 
     def flush(self):
-        if self._unsaved_seconds > 0:
+        if self._unsaved_seconds > 0 or self._dirty:
             self._save()
             self._unsaved_seconds = 0
 
-    def import_data(self, new_data: dict):
+    def import_data(self, new_data: dict, log_bytes: bytes | None = None):
         """
         Import data from backup.
         Expects keys: total_focus_seconds, total_focus_sessions, bucket_seconds
+        The session log is replaced by log_bytes (empty if the backup has none).
         """
         if not isinstance(new_data, dict):
             return False
-        
+
         # Basic validation
         req_keys = ["total_focus_seconds", "total_focus_sessions", "bucket_seconds"]
         for k in req_keys:
             if k not in new_data:
                 return False
-        
-        # Update and save
+
+        try:
+            with open(self.LOG_PATH, "wb") as f:
+                f.write(log_bytes or b"")
+        except Exception:
+            return False
+
+        # Update and save; older backups have no offset and cover the whole log
         self.data = new_data
+        if "log_offset" not in self.data:
+            self.data["log_offset"] = len(log_bytes or b"")
+        self._replay_log()
         self._save()
         return True
 
     def clear_data(self):
         """Reset all statistical data to zero/empty."""
-        self.data = {
-            "total_focus_seconds": 0,
-            "total_focus_sessions": 0,
-            "bucket_seconds": {
-                "midnight": 0,   # 00:00-06:00
-                "morning": 0,    # 06:00-12:00
-                "afternoon": 0,  # 12:00-18:00
-                "evening": 0     # 18:00-24:00
-            }
-        }
+        try:
+            with open(self.LOG_PATH, "wb"):
+                pass
+        except Exception:
+            pass
+        self.data = _empty_data()
         self._save()
+
+
+class SqliteStatsService(_StatsQueries):
+    """
+    SQLite backend with the same API as StatsService, for long histories.
+
+    Sessions live in an indexed table (WAL journal); running totals live in
+    a small key/value table so the summary never scans history. On first
+    use, the existing stats.json snapshot and sessions.jsonl log are
+    migrated once (legacy_path/legacy_log_path default to StatsService's).
+    """
+    PATH = os.path.join(ROOT, "stats.db")
+    BUCKETS = ("midnight", "morning", "afternoon", "evening")
+
+    def __init__(self, clock=None, legacy_path=None, legacy_log_path=None):
+        if clock is not None:
+            self._clock = clock
+        self.conn = sqlite3.connect(self.PATH)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "id INTEGER PRIMARY KEY, start REAL NOT NULL, end REAL NOT NULL, "
+                "duration INTEGER NOT NULL, phase TEXT NOT NULL, outcome TEXT NOT NULL, "
+                "counted INTEGER NOT NULL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_start ON sessions(start)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS totals (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        if self.conn.execute("SELECT 1 FROM meta WHERE key = 'migrated'").fetchone() is None:
+            self._migrate(legacy_path, legacy_log_path)
+        self.data = self._read_totals()
+
+    def _migrate(self, legacy_path=None, legacy_log_path=None):
+        # StatsService replays any log records its snapshot has not covered yet
+        legacy = StatsService(path=legacy_path, log_path=legacy_log_path)
+        records = list(legacy.iter_sessions())
+        with self.conn:
+            self._write_totals(legacy.data)
+            self._insert(records)
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated', ?)", (self._clock().isoformat(),))
+
+    def _insert(self, records):
+        self.conn.executemany(
+            "INSERT INTO sessions (start, end, duration, phase, outcome, counted) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (float(r.get("start", 0)), float(r.get("end", 0)), int(r.get("duration", 0)),
+                 r.get("phase", "WORK"), r.get("outcome", "completed"), 1 if r.get("counted") else 0)
+                for r in records
+            ],
+        )
+
+    def _write_totals(self, data):
+        rows = [
+            ("total_focus_seconds", int(data.get("total_focus_seconds", 0))),
+            ("total_focus_sessions", int(data.get("total_focus_sessions", 0))),
+        ]
+        buckets = data.get("bucket_seconds", {})
+        rows += [("bucket_" + k, int(buckets.get(k, 0))) for k in self.BUCKETS]
+        self.conn.execute("DELETE FROM totals")
+        self.conn.executemany("INSERT INTO totals (key, value) VALUES (?, ?)", rows)
+
+    def _read_totals(self):
+        data = _empty_data()
+        del data["log_offset"]
+        for row in self.conn.execute("SELECT key, value FROM totals"):
+            if row["key"].startswith("bucket_"):
+                data["bucket_seconds"][row["key"][len("bucket_"):]] = row["value"]
+            else:
+                data[row["key"]] = row["value"]
+        return data
+
+    def _bump(self, key, amount):
+        self.conn.execute(
+            "INSERT INTO totals (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value",
+            (key, amount),
+        )
+
+    def record_session(self, start: float, end: float, duration: int, phase="WORK", outcome="completed"):
+        counted = phase == "WORK" and duration >= MIN_SESSION_SECONDS
+        record = {"start": start, "end": end, "duration": int(duration), "phase": phase, "outcome": outcome, "counted": counted}
+        with self.conn:
+            self._insert([record])
+            if counted:
+                key = _bucket_for(datetime.fromtimestamp(end))
+                self._bump("total_focus_seconds", int(duration))
+                self._bump("total_focus_sessions", 1)
+                self._bump("bucket_" + key, int(duration))
+        if counted:
+            self.data["total_focus_seconds"] += int(duration)
+            self.data["total_focus_sessions"] += 1
+            self.data["bucket_seconds"][key] += int(duration)
+
+    def iter_sessions(self):
+        for row in self.conn.execute("SELECT * FROM sessions ORDER BY start"):
+            yield self._row_to_record(row)
+
+    @staticmethod
+    def _row_to_record(row):
+        return {
+            "start": row["start"], "end": row["end"], "duration": row["duration"],
+            "phase": row["phase"], "outcome": row["outcome"], "counted": bool(row["counted"]),
+        }
+
+    def sessions_between(self, start: datetime, end: datetime):
+        rows = self.conn.execute(
+            "SELECT * FROM sessions WHERE start >= ? AND start < ? ORDER BY start",
+            (start.timestamp(), end.timestamp()),
+        )
+        return [self._row_to_record(r) for r in rows]
+
+    def summary_between(self, start: datetime, end: datetime):
+        row = self.conn.execute(
+            "SELECT COALESCE(SUM(duration), 0) AS seconds, COUNT(*) AS sessions "
+            "FROM sessions WHERE counted = 1 AND start >= ? AND start < ?",
+            (start.timestamp(), end.timestamp()),
+        ).fetchone()
+        return {"focus_seconds": int(row["seconds"]), "focus_sessions": int(row["sessions"])}
+
+    def summaries_for(self, periods=("day", "week", "month"), when: datetime | None = None):
+        # One indexed aggregate per period beats fetching every row of the widest range
+        when = when or self._clock()
+        return {p: self.summary_between(*RANGES[p](when)) for p in periods}
+
+    def add_work_seconds(self, seconds: int, now: datetime | None = None):
+        if seconds <= 0:
+            return
+        key = _bucket_for(now or self._clock())
+        with self.conn:
+            self._bump("total_focus_seconds", seconds)
+            self._bump("bucket_" + key, seconds)
+        self.data["total_focus_seconds"] += seconds
+        self.data["bucket_seconds"][key] += seconds
+
+    def increment_session(self):
+        with self.conn:
+            self._bump("total_focus_sessions", 1)
+        self.data["total_focus_sessions"] += 1
+
+    def has_pending(self):
+        return False
+
+    def flush(self):
+        # Every write is already committed; fold the WAL back into the main file
+        try:
+            self.conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        self.conn.close()
+
+    def export_data(self):
+        """Same backup format as StatsService: snapshot dict plus JSONL log."""
+        lines = [json.dumps(r, ensure_ascii=False) + "\n" for r in self.iter_sessions()]
+        log_bytes = "".join(lines).encode("utf-8")
+        data = dict(self.data)
+        data["log_offset"] = len(log_bytes)
+        return data, log_bytes
+
+    def import_data(self, new_data: dict, log_bytes: bytes | None = None):
+        if not isinstance(new_data, dict):
+            return False
+        for k in ("total_focus_seconds", "total_focus_sessions", "bucket_seconds"):
+            if k not in new_data:
+                return False
+        records = []
+        for line in (log_bytes or b"").splitlines():
+            try:
+                records.append(json.loads(line))
+            except Exception:
+                continue
+        with self.conn:
+            self.conn.execute("DELETE FROM sessions")
+            self._insert(records)
+            self._write_totals(new_data)
+        self.data = self._read_totals()
+        return True
+
+    def clear_data(self):
+        """Reset all statistical data to zero/empty."""
+        with self.conn:
+            self.conn.execute("DELETE FROM sessions")
+            self._write_totals(_empty_data())
+        self.data = self._read_totals()
+
+
+def create_stats_service(config, clock=None):
+    """Pick the stats backend from config["statsBackend"] ("json" or "sqlite")."""
+    if config.get("statsBackend", "json") == "sqlite":
+        try:
+            return SqliteStatsService(clock)
+        except Exception as e:
+            print(f"SQLite stats unavailable, using JSON: {e}")
+    return StatsService(clock)
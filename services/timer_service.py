@@ -1,85 +1,162 @@
-from PySide6.QtCore import QObject, Signal, QTimer
+import math
+import time
+from PySide6.QtCore import QObject, Signal, QTimer, Qt
+from services.stats_service import MIN_SESSION_SECONDS
+from services.config_service import Config
+
+COUNTUP_LIMIT = 90 * 60
+
+
+class ManualTicks(QObject):
+    """
+    Tick source that only fires when told to. Stands in for the QTimer in
+    tests and soak runs: start(ms) records the requested delay, fire()
+    delivers the tick.
+    """
+    timeout = Signal()
+
+    def __init__(self):
+        super().__init__()
+        self.pending = None  # requested delay in ms, None when stopped
+
+    def start(self, ms):
+        self.pending = ms
+
+    def stop(self):
+        self.pending = None
+
+    def isActive(self):
+        return self.pending is not None
+
+    def fire(self):
+        self.pending = None
+        self.timeout.emit()
+
 
 class TimerService(QObject):
     ticked = Signal(int, int)
     phase_changed = Signal(str)
     completed = Signal()
 
-    def __init__(self, config, stats_service=None):
+    def __init__(self, config, stats_service=None, clock=None, wall_clock=None, tick_source=None):
+        """
+        clock: monotonic seconds for elapsed time (time.monotonic);
+        wall_clock: epoch seconds stamped on logged sessions (time.time);
+        tick_source: QTimer-like object with timeout, start(ms) and stop().
+        """
         super().__init__()
-        self.config = config
+        # Typed config: hot paths read plain attributes instead of dict lookups
+        self.config = config if isinstance(config, Config) else Config(config)
         self.stats = stats_service
-        self.timer = QTimer()
-        self.timer.setInterval(1000)
+        # Ticks only refresh the display; time itself always comes from the clock
+        if tick_source is None:
+            tick_source = QTimer()
+            tick_source.setSingleShot(True)
+            tick_source.setTimerType(Qt.PreciseTimer)
+        self.timer = tick_source
         self.timer.timeout.connect(self._on_tick)
+        self._clock = clock or time.monotonic
+        self._wall_clock = wall_clock or time.time
         self.sessions_completed = 0
         self.phase = "WORK"
-        self._mm = self.config.get("workMinutes", 25)
-        self._ss = 0
         self.running = False
         self.pending_next_phase = None
-        self._countup_seconds = 0
-        self._current_session_seconds = 0
+        self._phase_seconds = self.config.workMinutes * 60
+        self._elapsed_before = 0.0  # seconds run before the current segment
+        self._run_started = None    # clock value when the current segment started
+        self._session_offset = 0.0  # elapsed seconds already finalized
+        self._session_started = None  # wall time the current work session first ran
+
+    def elapsed(self):
+        """Seconds run in the current phase, excluding paused time."""
+        if self._run_started is None:
+            return self._elapsed_before
+        return self._elapsed_before + (self._clock() - self._run_started)
+
+    def remaining(self):
+        return max(0.0, self._phase_seconds - self.elapsed())
+
+    def _begin_phase(self, minutes):
+        self._phase_seconds = minutes * 60
+        self._elapsed_before = 0.0
+        self._session_offset = 0.0
+        self._session_started = self._wall_clock() if self.running else None
+        self._run_started = self._clock() if self.running else None
 
-    def _finalize_session(self):
+    def _stop_clock(self, elapsed=None):
+        self._elapsed_before = self.elapsed() if elapsed is None else elapsed
+        self._run_started = None
+        self.running = False
+        self.timer.stop()
+
+    def _schedule_tick(self):
+        # Land the next tick just past the next whole second of elapsed time
+        frac = self.elapsed() % 1.0
+        self.timer.start(int((1.0 - frac) * 1000) + 1)
+
+    def _display(self):
+        if self.config.countUpMode:
+            return divmod(int(self.elapsed()), 60)
+        return divmod(int(math.ceil(self.remaining())), 60)
+
+    def _finalize_session(self, outcome="reset"):
         """
-        Check if the current session is valid (>2 mins) and save stats.
+        Log the current work session and count it if valid (>2 mins).
         Increments sessions_completed only if valid.
-        Resets _current_session_seconds.
+        Marks the elapsed time so far as finalized.
         """
+        elapsed = self.elapsed()
         if self.phase == "WORK":
+            seconds = int(elapsed - self._session_offset)
             # Only count if duration >= 2 minutes (120 seconds)
-            if self._current_session_seconds >= 120:
+            if seconds >= MIN_SESSION_SECONDS:
                 self.sessions_completed += 1
-                if self.stats:
-                    try:
-                        self.stats.add_work_seconds(self._current_session_seconds)
-                        self.stats.increment_session()
-                        self.stats.flush()
-                    except Exception:
-                        pass
-        self._current_session_seconds = 0
+            if self.stats and seconds > 0:
+                end = self._wall_clock()
+                start = self._session_started if self._session_started is not None else end - seconds
+                try:
+                    self.stats.record_session(start, end, seconds, self.phase, outcome)
+                except Exception:
+                    pass
+        self._session_offset = elapsed
+        self._session_started = None
 
     def start(self):
         if self.pending_next_phase:
             nextp = self.pending_next_phase
             if nextp == "LONG_BREAK":
-                self._mm = self.config.get("longBreakMinutes", 15)
-                self._ss = 0
+                self._begin_phase(self.config.longBreakMinutes)
             elif nextp == "SHORT_BREAK":
-                self._mm = self.config.get("shortBreakMinutes", 5)
-                self._ss = 0
+                self._begin_phase(self.config.shortBreakMinutes)
             else:
-                self._mm = self.config.get("workMinutes", 25)
-                self._ss = 0
-                self._current_session_seconds = 0  # Reset for new work session
+                self._begin_phase(self.config.workMinutes)
             self.phase = nextp
             self.pending_next_phase = None
             self.phase_changed.emit(self.phase)
-            self.ticked.emit(self._mm, self._ss)
-        self.running = True
-        self.timer.start()
+            self.ticked.emit(*self._display())
+        if not self.running:
+            self.running = True
+            self._run_started = self._clock()
+            if self._session_started is None:
+                self._session_started = self._wall_clock()
+        self._schedule_tick()
 
     def pause(self):
-        self.running = False
+        if self.running:
+            self._stop_clock()
         self.timer.stop()
 
     def reset(self):
         self._finalize_session()  # Check and save stats if valid
-        self.running = False
-        self.timer.stop()
+        self._stop_clock()
         self.pending_next_phase = None
         self.phase = "WORK"
-        if self.config.get("countUpMode", False):
-            self._mm = 0
-            self._ss = 0
+        if self.config.countUpMode:
+            self._begin_phase(0)
         else:
-            self._mm = self.config.get("workMinutes", 25)
-            self._ss = 0
-        self._countup_seconds = 0
-        self._current_session_seconds = 0
+            self._begin_phase(self.config.workMinutes)
         self.phase_changed.emit(self.phase)
-        self.ticked.emit(self._mm, self._ss)
+        self.ticked.emit(*self._display())
 
     def text_end(self):
         # helper to signal end for UI flash logic
@@ -87,11 +164,9 @@ class TimerService(QObject):
 
     def set_countup_zero(self):
         self._finalize_session()  # Check and save stats if valid
-        self.running = False
-        self.timer.stop()
-        self._countup_seconds = 0
-        self._current_session_seconds = 0
+        self._stop_clock()
         self.phase = "WORK"
+        self._begin_phase(0)
         self.ticked.emit(0, 0)
         self.phase_changed.emit(self.phase)
 
@@ -101,73 +176,56 @@ class TimerService(QObject):
     def _on_tick(self):
         if not self.running:
             return
+        elapsed = self.elapsed()
 
-        # Track duration for stats (for both modes)
-        if self.phase == "WORK":
-            self._current_session_seconds += 1
-
-        if self.config.get("countUpMode", False):
-            # count-up mode: increase seconds, cap at 90 minutes
-            self._countup_seconds += 1
-            total = self._countup_seconds
-            if total >= 90 * 60:
-                self._countup_seconds = 90 * 60
-                self.running = False
-                self.timer.stop()
+        if self.config.countUpMode:
+            # count-up mode: cap at 90 minutes
+            if elapsed >= COUNTUP_LIMIT:
+                self._stop_clock(COUNTUP_LIMIT)
                 self.text_end()
                 self.ticked.emit(0, 0)
-                self._finalize_session()  # Save stats
+                self._finalize_session("completed")  # Save stats
                 self.completed.emit()
                 return
-            mm = total // 60
-            ss = total % 60
-            self.ticked.emit(mm, ss)
+            self.ticked.emit(*divmod(int(elapsed), 60))
+            self._schedule_tick()
             return
 
         # Tomato Mode logic
-        if self._mm == 0 and self._ss == 0:
-            self._finalize_session()  # Save stats if valid
+        if elapsed >= self._phase_seconds:
+            self._stop_clock(self._phase_seconds)
+            self._finalize_session("completed")  # Save stats if valid
             self.completed.emit()
 
             # Always pause at completion and set the next phase as pending
             nextp = None
             if self.phase == "WORK":
                 # sessions_completed was incremented in _finalize_session if valid
-                if self.sessions_completed > 0 and self.sessions_completed % self.config.get("sessionsBeforeLongBreak", 4) == 0:
+                if self.sessions_completed > 0 and self.sessions_completed % self.config.sessionsBeforeLongBreak == 0:
                     nextp = "LONG_BREAK"
                 else:
                     nextp = "SHORT_BREAK"
             else:
                 nextp = "WORK"
             self.pending_next_phase = nextp
-            self.running = False
-            self.timer.stop()
             self.ticked.emit(0, 0)
             return
-        
-        if self._ss == 0:
-            self._mm -= 1
-            self._ss = 59
-        else:
-            self._ss -= 1
-        self.ticked.emit(self._mm, self._ss)
+
+        self.ticked.emit(*self._display())
+        self._schedule_tick()
 
     def _next_phase(self):
         if self.phase == "WORK":
-            self._finalize_session()  # Save stats if valid
-            
-            if self.sessions_completed > 0 and self.sessions_completed % self.config.get("sessionsBeforeLongBreak", 4) == 0:
+            self._finalize_session("skipped")  # Save stats if valid
+
+            if self.sessions_completed > 0 and self.sessions_completed % self.config.sessionsBeforeLongBreak == 0:
                 self.phase = "LONG_BREAK"
-                self._mm = self.config.get("longBreakMinutes", 15)
-                self._ss = 0
+                self._begin_phase(self.config.longBreakMinutes)
             else:
                 self.phase = "SHORT_BREAK"
-                self._mm = self.config.get("shortBreakMinutes", 5)
-                self._ss = 0
+                self._begin_phase(self.config.shortBreakMinutes)
         else:
             self.phase = "WORK"
-            self._mm = self.config.get("workMinutes", 25)
-            self._ss = 0
-            self._current_session_seconds = 0  # Reset for new work session
+            self._begin_phase(self.config.workMinutes)
         self.phase_changed.emit(self.phase)
-        self.ticked.emit(self._mm, self._ss)
+        self.ticked.emit(*self._display())
@@ -0,0 +1,195 @@
+"""
+On-disk cache of decoded skin frames.
+
+Each skin directory gets one raw file under cache/skins/: a JSON header
+padded to HEADER_SIZE bytes followed by the frames as uncompressed
+ARGB32_Premultiplied pixels. A cache hit memory-maps the file and builds
+QImages straight over the mapping, so no PNG is inflated at startup.
+The key covers the directory path plus every file's name, mtime and
+size, so editing a skin simply misses and rewrites the cache. After each
+write, caches of skin directories that no longer exist are dropped and
+the whole directory is kept under MAX_CACHE_BYTES, evicting the least
+recently used files first (a hit refreshes the file's mtime).
+"""
+import hashlib
+import json
+import mmap
+import os
+import threading
+
+from PySide6.QtGui import QImage
+
+CACHE_DIR = os.path.join(os.getcwd(), "cache", "skins")
+WRITER_NAME = "skin-cache-writer"
+HEADER_SIZE = 4096
+FORMAT = QImage.Format_ARGB32_Premultiplied
+VERSION = 1
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+
+def _dir_tag(base):
+    path = os.path.normcase(os.path.abspath(base))
+    return hashlib.sha1(path.encode("utf-8")).hexdigest()[:16]
+
+
+def cache_key(base):
+    try:
+        entries = sorted(
+            (e for e in os.scandir(base) if e.is_file() and e.name.lower().endswith((".png", ".json"))),
+            key=lambda e: e.name,
+        )
+        h = hashlib.sha1()
+        for e in entries:
+            st = e.stat()
+            h.update(f"{e.name}|{st.st_mtime_ns}|{st.st_size}\n".encode("utf-8"))
+    except OSError:
+        return None
+    return f"{_dir_tag(base)}_{h.hexdigest()[:16]}"
+
+
+class CachedFrames:
+    """Frames served from a memory-mapped cache file."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = json.loads(bytes(self._map[:HEADER_SIZE]).split(b"\n", 1)[0])
+        if header.get("version") != VERSION:
+            raise ValueError("cache version mismatch")
+        self.width = int(header["width"])
+        self.height = int(header["height"])
+        self.count = int(header["count"])
+        self.animated = bool(header["animated"])
+        self.frame_durations = header.get("frameDurations")
+        self.frame_bytes = self.width * self.height * 4
+        if len(self._map) != HEADER_SIZE + self.count * self.frame_bytes:
+            raise ValueError("truncated cache file")
+        self._view = memoryview(self._map)
+
+    def frame(self, index):
+        # The image borrows the mapped bytes; the mapping lives as long as self
+        offset = HEADER_SIZE + index * self.frame_bytes
+        return QImage(self._view[offset:offset + self.frame_bytes], self.width, self.height, self.width * 4, FORMAT)
+
+    def sources(self):
+        return [lambda i=i: self.frame(i) for i in range(self.count)]
+
+
+def load(key):
+    if not key:
+        return None
+    path = os.path.join(CACHE_DIR, key + ".raw")
+    if not os.path.exists(path):
+        return None
+    try:
+        frames = CachedFrames(path)
+    except Exception:
+        return None
+    try:
+        os.utime(path)  # recency for LRU eviction
+    except OSError:
+        pass
+    return frames
+
+
+def _source_of(path):
+    try:
+        with open(path, "rb") as f:
+            return json.loads(f.read(HEADER_SIZE).split(b"\n", 1)[0]).get("source")
+    except Exception:
+        return None
+
+
+def _evict(keep):
+    """Drop caches of vanished skin dirs, then the oldest files until under MAX_CACHE_BYTES."""
+    entries = []
+    for e in os.scandir(CACHE_DIR):
+        if not e.is_file() or e.name == keep:
+            continue
+        source = _source_of(e.path) if e.name.endswith(".raw") else None
+        if e.name.endswith(".tmp") or (source and not os.path.isdir(source)):
+            try:
+                os.remove(e.path)
+            except OSError:
+                pass
+            continue
+        st = e.stat()
+        entries.append((st.st_mtime, st.st_size, e.path))
+    try:
+        total = os.path.getsize(os.path.join(CACHE_DIR, keep))
+    except OSError:
+        total = 0
+    total += sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= MAX_CACHE_BYTES:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def _write(key, sources, animated, frame_durations, source_dir=None):
+    tmp_path = None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        path = os.path.join(CACHE_DIR, key + ".raw")
+        tmp_path = path + ".tmp"
+        header = None
+        with open(tmp_path, "wb") as f:
+            f.write(b"\0" * HEADER_SIZE)
+            for source in sources:
+                img = source().convertToFormat(FORMAT)
+                if img.isNull():
+                    return
+                if header is None:
+                    header = {"version": VERSION, "width": img.width(), "height": img.height()}
+                elif img.width() != header["width"] or img.height() != header["height"]:
+                    return
+                f.write(bytes(img.constBits())[:img.width() * img.height() * 4])
+            if header is None:
+                return
+            header.update(count=len(sources), animated=animated, frameDurations=frame_durations, source=source_dir)
+            f.seek(0)
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+        os.replace(tmp_path, path)
+        tmp_path = None
+        # Drop stale caches of the same skin directory
+        prefix = key.split("_", 1)[0] + "_"
+        for name in os.listdir(CACHE_DIR):
+            if name.startswith(prefix) and name != key + ".raw":
+                try:
+                    os.remove(os.path.join(CACHE_DIR, name))
+                except OSError:
+                    pass
+        _evict(key + ".raw")
+        return True
+    except Exception as e:
+        print(f"Skin cache write failed: {e}")
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def _store(key, sources, animated, frame_durations, source_dir, on_done):
+    if _write(key, sources, animated, frame_durations, source_dir) and on_done is not None:
+        on_done(key)
+
+
+def store_async(key, sources, animated, frame_durations=None, source=None, on_done=None):
+    """
+    Decode every frame on a background thread and write the cache file;
+    on_done(key) is then called on that thread.
+    """
+    if not key:
+        return None
+    if source is not None:
+        source = os.path.abspath(source)
+    t = threading.Thread(target=_store, args=(key, list(sources), animated, frame_durations, source, on_done),
+                         name=WRITER_NAME, daemon=True)
+    t.start()
+    return t
@@ -1,48 +1,446 @@
 import os
 import sys
-from PySide6.QtGui import QPixmap
+import threading
+from collections import OrderedDict
+from functools import partial
+from PySide6.QtGui import QPixmap, QImage, QImageReader
+from PySide6.QtCore import Qt, QSize, QRect, QPoint, QThread, QThreadPool, Signal
+from skin import frame_cache
 
 if getattr(sys, 'frozen', False):
     ROOT = sys._MEIPASS
 else:
     ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
 
+FRAME_SIZE = QSize(256, 256)
+SHEET_NAME = "skin_sheet.png"
 
-def load_skin(skin_id):
+
+def _read_image(path):
+    return QImageReader(path).read()
+
+
+class _SpriteSheet:
+    """
+    Packed skin image, decoded once and shared by all its frames. Once the
+    frame cache has been written, frames come from that file and the
+    decoded sheet (every frame at once) is released.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rects = []
+        self._image = None
+        self._cached = None
+        self._lock = threading.Lock()
+
+    def frame(self, index):
+        # Called from prefetch workers as well as the GUI thread
+        with self._lock:
+            if self._cached is not None:
+                return self._cached.frame(index)
+            if self._image is None:
+                self._image = _read_image(self.path)
+            return self._image.copy(self.rects[index])
+
+    def adopt_cache(self, key):
+        """Serve frames from the written cache file; called on the cache writer thread."""
+        cached = frame_cache.load(key)
+        if cached is None or cached.count != len(self.rects):
+            return
+        with self._lock:
+            self._cached = cached
+            self._image = None
+
+
+def _sheet_of(source):
+    """The _SpriteSheet behind a packed frame source, else None."""
+    sheet = getattr(getattr(source, "func", None), "__self__", None)
+    return sheet if isinstance(sheet, _SpriteSheet) else None
+
+
+def _sheet_sources(base, meta):
+    """
+    Frame sources for a packed skin described by the "sheet" entry of skin.json:
+    {"image": "skin_sheet.png", "frames": [{"x": 0, "y": 0, "w": 256, "h": 256, "duration": 100}, ...]}
+    Per-frame durations, when given, are exposed as meta["frameDurations"].
+    """
+    sheet = meta.get("sheet") if isinstance(meta, dict) else None
+    if not isinstance(sheet, dict):
+        return None
+    path = os.path.join(base, str(sheet.get("image", SHEET_NAME)))
+    if not os.path.exists(path):
+        return None
+    bounds = QRect(QPoint(0, 0), QImageReader(path).size())
+    packed = _SpriteSheet(path)
+    sources = []
+    durations = []
+    for entry in sheet.get("frames", []):
+        try:
+            rect = QRect(int(entry["x"]), int(entry["y"]), int(entry.get("w", 256)), int(entry.get("h", 256)))
+        except Exception:
+            continue
+        if rect.size() != FRAME_SIZE or not bounds.contains(rect):
+            continue
+        sources.append(partial(packed.frame, len(packed.rects)))
+        packed.rects.append(rect)
+        durations.append(entry.get("duration"))
+    if not sources:
+        return None
+    if any(d is not None for d in durations):
+        meta["frameDurations"] = durations
+    return sources
+
+
+# Above one 60 Hz refresh interval, so every animation frame can be presented
+MIN_FRAME_MS = 20
+MAX_LOOP_REPEAT = 100
+
+
+def _loop_ranges(meta, count):
+    # "loop": [start, end] or "loops": [[start, end, repeat], {"start", "end", "repeat"}, ...]
+    raw = meta.get("loops")
+    if raw is None and "loop" in meta:
+        raw = [meta["loop"]]
+    ranges = []
+    for item in raw if isinstance(raw, list) else []:
+        try:
+            if isinstance(item, dict):
+                start, end, repeat = item["start"], item["end"], item.get("repeat")
+            else:
+                start, end = item[0], item[1]
+                repeat = item[2] if len(item) > 2 else None
+            start, end = int(start), int(end)
+            repeat = None if repeat is None or int(repeat) <= 0 else min(int(repeat), MAX_LOOP_REPEAT)
+        except (KeyError, IndexError, TypeError, ValueError):
+            continue
+        if 0 <= start <= end < count:
+            ranges.append((start, end, repeat))
+    return sorted(ranges)
+
+
+def frame_timeline(meta, count, default_ms=100):
+    """
+    Playback plan for an animated skin from skin.json.
+
+    "frameDurations": per-frame hold in ms (missing or null entries use
+    default_ms). "loop": [start, end] plays frames 0..end once and then
+    repeats start..end forever; "loops" lists several ranges, each with
+    an optional repeat count, played in order; the last range without a
+    count (or the whole animation) loops forever.
+
+    Returns (steps, loop_at): steps is a list of (frame index, ms) and
+    playback continues at steps[loop_at] after the last step.
+    """
+    meta = meta if isinstance(meta, dict) else {}
+    durations = meta.get("frameDurations")
+    durations = durations if isinstance(durations, list) else []
+
+    def step(i):
+        try:
+            ms = int(durations[i]) if i < len(durations) and durations[i] is not None else default_ms
+        except (TypeError, ValueError):
+            ms = default_ms
+        return (i, max(MIN_FRAME_MS, ms))
+
+    steps = []
+    pos = 0
+    for start, end, repeat in _loop_ranges(meta, count):
+        if start < pos:
+            continue  # overlapping ranges are ignored
+        steps.extend(step(i) for i in range(pos, end + 1))
+        if repeat is None:
+            return _merge_holds(steps, len(steps) - (end - start + 1))
+        for _ in range(repeat - 1):
+            steps.extend(step(i) for i in range(start, end + 1))
+        pos = end + 1
+    steps.extend(step(i) for i in range(pos, count))
+    return _merge_holds(steps or [step(0)], 0)
+
+
+def _merge_holds(steps, loop_at):
+    # Consecutive steps showing the same frame become one longer sleep
+    merged = []
+    for i, (frame, ms) in enumerate(steps):
+        if i == loop_at:
+            loop_at = len(merged)
+        elif merged and merged[-1][0] == frame:
+            merged[-1] = (frame, merged[-1][1] + ms)
+            continue
+        merged.append((frame, ms))
+    return merged, loop_at
+
+
+class FrameSequence:
+    """
+    Skin frames indexed like a list, handed out already scaled to the
+    current uiScale (nearest-neighbour) so compose is a 1:1 blit.
+
+    Frames are decoded on demand: a bounded LRU keeps at most cache_size
+    pixmaps alive, and the next `lookahead` frames are decoded into
+    QImages on the thread pool so playback rarely waits on a decode.
+    Each source is a zero-argument callable returning an unscaled QImage.
+    """
+
+    def __init__(self, sources, scale=1, cache_size=16, lookahead=4):
+        self._sources = list(sources)
+        self.scale = scale
+        self.cache_size = max(1, cache_size)
+        self.lookahead = lookahead
+        self._cache = OrderedDict()
+        # Filled by prefetch workers; guarded by _lock
+        self._ready = {}
+        self._pending = set()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def set_scale(self, scale):
+        if scale != self.scale:
+            with self._lock:
+                self.scale = scale
+                self._generation += 1
+                self._ready.clear()
+                self._pending.clear()
+            self._cache.clear()
+
+    def decode(self, index):
+        """Decode one frame at the current scale into a QImage (thread-safe)."""
+        return self._decode(index, self.scale)
+
+    def prime(self, index, image):
+        """Hand over a frame already decoded elsewhere, e.g. by a SkinLoadTask."""
+        if image.width() == int(FRAME_SIZE.width() * self.scale):
+            with self._lock:
+                self._ready[index] = image
+
+    def _decode(self, index, scale):
+        img = self._sources[index]()
+        if img.isNull():
+            img = QImage(256, 256, QImage.Format_ARGB32_Premultiplied)
+            img.fill(Qt.transparent)
+        w = int(img.width() * scale)
+        h = int(img.height() * scale)
+        if w != img.width() or h != img.height():
+            img = img.scaled(w, h, Qt.IgnoreAspectRatio, Qt.FastTransformation)
+        return img
+
+    def _prefetch(self, index, generation, scale):
+        try:
+            img = self._decode(index, scale)
+        except Exception:
+            img = None
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._pending.discard(index)
+            if img is not None:
+                self._ready[index] = img
+
+    def _schedule(self, index):
+        n = len(self._sources)
+        if n <= self.cache_size and len(self._cache) == n:
+            return
+        for step in range(1, min(self.lookahead, n - 1) + 1):
+            j = (index + step) % n
+            if j in self._cache:
+                continue
+            with self._lock:
+                if j in self._pending or j in self._ready:
+                    continue
+                self._pending.add(j)
+                generation, scale = self._generation, self.scale
+            QThreadPool.globalInstance().start(partial(self._prefetch, j, generation, scale))
+
+    def rebase(self, old_dir, new_dir):
+        """Follow a rename of the skin directory: file sources under old_dir now read from new_dir."""
+        old_dir = os.path.abspath(old_dir)
+
+        def moved(path):
+            path = os.path.abspath(path)
+            if os.path.normcase(os.path.dirname(path)) != os.path.normcase(old_dir):
+                return None
+            return os.path.join(new_dir, os.path.basename(path))
+
+        for i, source in enumerate(self._sources):
+            if not isinstance(source, partial):
+                continue  # in-memory or cache-mapped frames do not read the skin dir
+            if source.func is _read_image:
+                path = moved(source.args[0])
+                if path:
+                    self._sources[i] = partial(_read_image, path)
+                continue
+            sheet = _sheet_of(source)
+            if sheet is not None:
+                with sheet._lock:
+                    sheet.path = moved(sheet.path) or sheet.path
+
+    def __len__(self):
+        return len(self._sources)
+
+    def __getitem__(self, index):
+        n = len(self._sources)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("frame index out of range")
+        pm = self._cache.get(index)
+        if pm is not None:
+            self._cache.move_to_end(index)
+        else:
+            with self._lock:
+                img = self._ready.pop(index, None)
+            if img is None:
+                img = self._decode(index, self.scale)
+            # QPixmap must be created on the GUI thread
+            pm = QPixmap.fromImage(img)
+            self._cache[index] = pm
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        self._schedule(index)
+        return pm
+
+    def __iter__(self):
+        for i in range(len(self._sources)):
+            yield self[i]
+
+
+class LoadedSkin:
+    """Result of preparing a skin; frames() must be called on the GUI thread."""
+
+    def __init__(self, skin_id, sources, animated, meta, scale, first=None):
+        self.skin_id = skin_id
+        self.sources = sources
+        self.animated = animated
+        self.meta = meta
+        self.scale = scale
+        self.first = first
+
+    def frames(self):
+        frames = FrameSequence(self.sources, self.scale)
+        if self.first is not None:
+            frames.prime(0, self.first)
+        # Only frame 0 is decoded before the window can appear
+        frames[0]
+        return frames
+
+
+def _prepare_skin(skin_id, scale=1, use_cache=True, progress=None):
     if os.path.isabs(skin_id):
         base = skin_id
     else:
         base = os.path.join(ROOT, "skins", skin_id)
-        
-    frames = []
+
+    meta = _load_meta(base)
+    key = frame_cache.cache_key(base) if use_cache else None
+    cached = frame_cache.load(key)
+    if cached is not None:
+        # Raw pixels mapped straight from disk: no PNG inflate, no size checks
+        sources, animated = cached.sources(), cached.animated
+        if cached.frame_durations is not None and isinstance(meta, dict):
+            meta["frameDurations"] = cached.frame_durations
+    else:
+        sources, animated = _discover_frames(base, meta, progress)
+        durations = meta.get("frameDurations") if isinstance(meta, dict) else None
+        sheet = _sheet_of(sources[0]) if sources else None
+        frame_cache.store_async(key, sources, animated, durations, source=base,
+                                on_done=sheet.adopt_cache if sheet is not None else None)
+    return LoadedSkin(skin_id, sources, animated, meta, scale)
+
+
+def load_skin(skin_id, scale=1, use_cache=True):
+    skin = _prepare_skin(skin_id, scale, use_cache)
+    return skin.frames(), skin.animated, skin.meta
+
+
+def validate_skin(path):
+    """Check that a skin directory loads and its first frame decodes; safe off the GUI thread."""
+    skin = _prepare_skin(path, use_cache=False)
+    if skin.sources[0]().isNull():
+        raise ValueError(f"Cannot decode first frame of {path}")
+
+
+class SkinLoadTask(QThread):
+    """
+    Prepare a skin and decode its first frame off the GUI thread.
+    Emits loaded(LoadedSkin) or failed(str); progress(done, total) while
+    frame headers are checked.
+    """
+    progress = Signal(int, int)
+    loaded = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, skin_id, scale=1, parent=None):
+        super().__init__(parent)
+        self.skin_id = skin_id
+        self.scale = scale
+
+    def run(self):
+        try:
+            skin = _prepare_skin(self.skin_id, self.scale, progress=self.progress.emit)
+            skin.first = FrameSequence(skin.sources, skin.scale).decode(0)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.loaded.emit(skin)
+
+
+# Keep running tasks referenced until their thread has finished
+_active_tasks = set()
+
+
+def _forget_task(task):
+    task.wait()
+    _active_tasks.discard(task)
+
+
+def load_skin_async(skin_id, scale=1):
+    task = SkinLoadTask(skin_id, scale)
+    _active_tasks.add(task)
+    task.finished.connect(partial(_forget_task, task))
+    task.start()
+    return task
+
+
+def _discover_frames(base, meta, progress=None):
+    # Packed sprite sheet: one file read and one decode for the whole skin
+    sources = _sheet_sources(base, meta)
+    if sources:
+        return sources, len(sources) > 1
+
     seq = []
     try:
         if os.path.exists(base):
             for name in os.listdir(base):
-                if name.lower().startswith("skin_") and name.lower().endswith(".png"):
+                if name.lower().startswith("skin_") and name.lower().endswith(".png") and name != SHEET_NAME:
                     seq.append(name)
     except Exception:
         pass
 
     if seq:
-        for name in sorted(seq):
-            p = QPixmap(os.path.join(base, name))
-            if p.isNull() or p.width() != 256 or p.height() != 256:
+        # Validate sizes from the PNG headers only; pixels are decoded lazily
+        paths = []
+        names = sorted(seq)
+        for i, name in enumerate(names):
+            if progress:
+                progress(i + 1, len(names))
+            path = os.path.join(base, name)
+            if QImageReader(path).size() != FRAME_SIZE:
                 continue
-            frames.append(p)
-        if frames:
-            return frames, True, _load_meta(base)
+            paths.append(path)
+        if paths:
+            return [partial(_read_image, p) for p in paths], True
 
     # Try single frame skin.png
     single_path = os.path.join(base, "skin.png")
     if os.path.exists(single_path):
-        p = QPixmap(single_path)
-        if not p.isNull() and p.width() == 256 and p.height() == 256:
-            return [p], False, _load_meta(base)
-            
+        img = _read_image(single_path)
+        if not img.isNull() and img.size() == FRAME_SIZE:
+            return [lambda: img], False
+
     # Raise exception if no valid skin found, caller should handle fallback
     raise ValueError(f"No valid 256x256 skin found in {base}")
 
+
 def _load_meta(base_path):
     import json
     meta_path = os.path.join(base_path, "skin.json")
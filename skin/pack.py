@@ -0,0 +1,90 @@
+"""
+Pack a folder of skin_###.png frames into a single sprite sheet.
+
+    python -m skin.pack <skin folder> [--columns N] [--duration MS]
+
+Writes skin_sheet.png next to the frames and adds a "sheet" index to
+skin.json (other keys are kept). load_skin prefers the sheet when present,
+so the original frames can be removed afterwards.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtCore import Qt
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+from skin.loader import FRAME_SIZE, SHEET_NAME, _load_meta
+
+
+def pack_skin(folder, columns=None, duration=None):
+    names = sorted(
+        name for name in os.listdir(folder)
+        if name.lower().startswith("skin_") and name.lower().endswith(".png") and name != SHEET_NAME
+    )
+    frames = []
+    for name in names:
+        img = QImage(os.path.join(folder, name))
+        if img.isNull() or img.size() != FRAME_SIZE:
+            print(f"skip {name}: not a 256x256 image")
+            continue
+        frames.append(img)
+    if not frames:
+        raise ValueError(f"No 256x256 skin_*.png frames found in {folder}")
+
+    meta = _load_meta(folder)
+    if not isinstance(meta, dict):
+        meta = {}
+    if duration is None:
+        duration = meta.get("frameDuration")
+
+    cols = columns or int(math.ceil(math.sqrt(len(frames))))
+    rows = int(math.ceil(len(frames) / cols))
+    fw, fh = FRAME_SIZE.width(), FRAME_SIZE.height()
+    sheet = QImage(cols * fw, rows * fh, QImage.Format_ARGB32)
+    sheet.fill(Qt.transparent)
+    p = QPainter(sheet)
+    p.setCompositionMode(QPainter.CompositionMode_Source)
+    index = []
+    for i, img in enumerate(frames):
+        x = (i % cols) * fw
+        y = (i // cols) * fh
+        p.drawImage(x, y, img)
+        entry = {"x": x, "y": y, "w": fw, "h": fh}
+        if duration is not None:
+            entry["duration"] = int(duration)
+        index.append(entry)
+    p.end()
+
+    sheet_path = os.path.join(folder, SHEET_NAME)
+    if not sheet.save(sheet_path, "PNG"):
+        raise OSError(f"Failed to write {sheet_path}")
+
+    meta["sheet"] = {"image": SHEET_NAME, "frames": index}
+    with open(os.path.join(folder, "skin.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    return sheet_path, len(index)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack skin_###.png frames into a sprite sheet")
+    parser.add_argument("folder", help="skin folder containing skin_###.png frames")
+    parser.add_argument("--columns", type=int, default=None, help="frames per sheet row (default: square-ish)")
+    parser.add_argument("--duration", type=int, default=None, help="per-frame duration in ms written to the index")
+    args = parser.parse_args(argv)
+    try:
+        path, count = pack_skin(args.folder, args.columns, args.duration)
+    except Exception as e:
+        print(f"Pack failed: {e}")
+        return 1
+    print(f"Packed {count} frames into {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
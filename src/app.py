@@ -1,6 +1,9 @@
+import time
+_STARTED = time.perf_counter()
+
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QIcon
-from PySide6.QtCore import QLocale, Qt
+from PySide6.QtCore import QLocale, Qt, QObject, QEvent, QTimer
 import sys, os
 
 # Copyright (c) 2025 @杰某official
@@ -16,9 +19,23 @@ else:
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 from services.config_service import ConfigService
+from services import perf
 from ui.main_window import MainWindow
 
+
+class _FirstPaint(QObject):
+    """Ends the startup report once the window's first paint has been flushed."""
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            QTimer.singleShot(0, lambda: perf.startup_end("first_paint"))
+        return False
+
+
 def main():
+    perf.startup_begin(_STARTED)
+    perf.startup_mark("import")
     # Force integer scale factors to ensure sharp pixel art
     # This prevents fractional scaling (e.g. 125% -> 1x, 150% -> 2x)
     os.environ["QT_AUTO_SCREEN_SCALE_FACTOR"] = "1"
@@ -33,6 +50,7 @@ def main():
     )
 
     app = QApplication(sys.argv)
+    perf.startup_mark("qapplication")
     
     # Load translations
     from PySide6.QtCore import QTranslator, QLibraryInfo
@@ -45,12 +63,15 @@ def main():
     translator = QTranslator(app)
     if translator.load("qt_zh_CN", path):
         app.installTranslator(translator)
+    perf.startup_mark("translator")
         
     ConfigService.ensure_defaults()
     cfg = ConfigService.load()
     if cfg.get("language") == "zh-CN":
         QLocale.setDefault(QLocale(QLocale.Chinese, QLocale.China))
+    perf.startup_mark("config")
     win = MainWindow(cfg)
+    perf.startup_mark("window")
     tray_ico = os.path.join(ROOT, "assets", "tray", "tray.ico")
     tray_png = os.path.join(ROOT, "assets", "tray", "tray.png")
     icon = QIcon(tray_ico) if os.path.exists(tray_ico) else (QIcon(tray_png) if os.path.exists(tray_png) else QIcon())
@@ -60,9 +81,14 @@ def main():
         try:
             if hasattr(win, "stats") and win.stats:
                 win.stats.flush()
+            # Let a running backup finish writing before the process exits
+            win.wait_for_jobs()
+            ConfigService.flush()
         except Exception:
             pass
     app.aboutToQuit.connect(_flush_stats)
+    first_paint = _FirstPaint(win)
+    win.installEventFilter(first_paint)
     win.show()
     sys.exit(app.exec())
 
@@ -1,5 +1,5 @@
 from PySide6.QtWidgets import QWidget, QApplication, QMenu, QMessageBox, QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTextEdit, QPushButton, QFileDialog
-from PySide6.QtGui import QPainter, QPixmap, QAction, QDesktopServices
+from PySide6.QtGui import QPainter, QPixmap, QAction, QDesktopServices, QRegion
 from PySide6.QtCore import Qt, QTimer, QRect, QUrl
 from services.timer_service import TimerService
 
@@ -9,16 +9,16 @@ from services.timer_service import TimerService
 
 from services.config_service import ConfigService
 from services.audio_service import AudioService
-from services.stats_service import StatsService
-from services.backup_service import BackupService
-from skin.loader import load_skin
+from services.stats_service import create_stats_service
+from services import perf
+from skin.loader import load_skin, load_skin_async, frame_timeline
 from render.renderer import Renderer
-from ui.settings_dialog import SettingsDialog
-from ui.scale_dialog import ScaleDialog
 from PySide6.QtWidgets import QSystemTrayIcon
 from PySide6.QtGui import QIcon, QColor
+import math
 import os
 import sys
+import time
 if getattr(sys, 'frozen', False):
     ROOT = sys._MEIPASS
 else:
@@ -34,7 +34,7 @@ class MainWindow(QWidget):
         self.setWindowFlag(Qt.FramelessWindowHint, True)
         self.setWindowFlag(Qt.Tool, True)
         self.setAttribute(Qt.WA_TranslucentBackground, True)
-        self.scale = float(self.config.get("uiScale", 1))
+        self.scale = self.config.uiScale
         self.setFixedSize(int(256 * self.scale), int(256 * self.scale))
         
         skin_id = self.config.get("skinId", "default")
@@ -45,44 +45,65 @@ class MainWindow(QWidget):
             
         self.renderer = Renderer(skin_path)
         try:
-            self.frames, self.is_animated, self.skin_meta = load_skin(skin_id)
+            self.frames, self.is_animated, self.skin_meta = load_skin(skin_id, self.scale)
         except Exception:
             # Fallback to default if loading fails
             self.config["skinId"] = "default"
             skin_id = "default"
             skin_path = os.path.join(ROOT, "skins", "default")
-            self.frames, self.is_animated, self.skin_meta = load_skin(skin_id)
+            self.frames, self.is_animated, self.skin_meta = load_skin(skin_id, self.scale)
+        perf.startup_mark("skin")
             
         # Apply skin text color if defined
         if "textColor" in self.skin_meta:
             self.config["textColor"] = self.skin_meta["textColor"]
 
         self.frame_index = 0
+        self._step = 0
+        self._frame_due = 0.0
         self.text = "{:02d}:{:02d}".format(self.config.get("workMinutes", 25), 0)
         self.show_pause_icon = False
         self.show_setting_icon = True
-        self.stats = StatsService()
+        self.stats = create_stats_service(self.config)
         self.timer_service = TimerService(self.config, stats_service=self.stats)
         self.audio = AudioService(self.config)
-        self.backup_service = BackupService(self.config)
+        # Created on first use (backup menu, auto backup); see backup_service
+        self._backup_service = None
         self.timer_service.ticked.connect(self._on_ticked)
         self.timer_service.phase_changed.connect(self._on_phase)
         self.timer_service.completed.connect(self._on_completed)
+        # Single-shot: sleeps exactly until the next frame change of the timeline
         self.anim = QTimer()
-        self.anim.setInterval(self.config.get("frameDuration", 100))
+        self.anim.setSingleShot(True)
+        self.anim.setTimerType(Qt.PreciseTimer)
         self.anim.timeout.connect(self._next_frame)
-        if self.is_animated:
-            self.anim.start()
+        self._restart_animation()
         self.tray = QSystemTrayIcon(self)
         self._setup_tray()
         self._dragging = False
         self._drag_offset = None
         self._composed = None
-        self.text_color = QColor(self.config.get("textColor", "#FFFFFF"))
+        self._dirty_rect = QRect()
+        # Single frame scheduler: every redraw request goes through _refresh
+        self._frame_pending = False
+        self._last_present = None
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.setTimerType(Qt.PreciseTimer)
+        self._frame_timer.timeout.connect(self._present_frame)
+        self._skin_task = None
+        self.text_color = self.config.text_qcolor
+        self.config.changed.connect(self._save_config)
+        self.config.groups_changed.connect(self._on_config_changed)
         self.flash_timer = QTimer()
         self.flash_timer.setInterval(150)
         self.flash_timer.timeout.connect(self._flash_step)
         self._flash_remaining = 0
+        self._overlay = None
+        self._perf_timer = QTimer(self)
+        self._perf_timer.setInterval(500)
+        self._perf_timer.timeout.connect(self._update_overlay)
+        self._apply_perf()
 
     def _setup_tray(self):
         skin_id = self.config.get("skinId", "default")
@@ -118,7 +139,7 @@ class MainWindow(QWidget):
         act_manual_backup = QAction("手动备份", self)
         act_auto_backup = QAction("开启自动备份", self)
         act_auto_backup.setCheckable(True)
-        act_auto_backup.setChecked(self.backup_service.is_auto_backup_enabled())
+        act_auto_backup.setChecked(bool(self.config.autoBackup))
         act_import_backup = QAction("导入备份文件", self)
         act_view_backups = QAction("查看备份文件", self)
         act_clear_history = QAction("清空历史数据", self)
@@ -136,6 +157,17 @@ class MainWindow(QWidget):
         backup_menu.addSeparator()
         backup_menu.addAction(act_clear_history)
 
+        # Diagnostics Menu
+        perf_menu = menu.addMenu("性能诊断")
+        act_perf_overlay = QAction("显示性能浮层", self)
+        act_perf_overlay.setCheckable(True)
+        act_perf_overlay.setChecked(self.config.perfOverlay)
+        act_perf_dump = QAction("导出性能快照", self)
+        act_perf_overlay.toggled.connect(self._toggle_perf_overlay)
+        act_perf_dump.triggered.connect(self._dump_profile)
+        perf_menu.addAction(act_perf_overlay)
+        perf_menu.addAction(act_perf_dump)
+
         act_quit = QAction("退出", self)
         act_toggle.triggered.connect(self._toggle_visibility)
         act_skin.triggered.connect(self._change_skin)
@@ -156,32 +188,117 @@ class MainWindow(QWidget):
         self.tray.setContextMenu(menu)
         self.tray.show()
 
+    @property
+    def backup_service(self):
+        if self._backup_service is None:
+            from services.backup_service import BackupService
+            self._backup_service = BackupService(self.config, self.stats)
+            self._backup_service.backup_finished.connect(self._on_backup_finished)
+            self._backup_service.import_progress.connect(self._on_import_progress)
+            self._backup_service.import_finished.connect(self._on_import_finished)
+            self._backup_service.skin_dir_moved.connect(self._on_skin_dir_moved)
+            if perf.enabled():
+                perf.enable()  # instrument the freshly imported module too
+        return self._backup_service
+
+    def wait_for_jobs(self):
+        """Block until a running backup or import has finished, e.g. on quit."""
+        if self._backup_service is not None:
+            # Quitting: nothing reads a retired skin copy any more
+            self._backup_service.release_retired_skins()
+            self._backup_service.wait()
+
     def _manual_backup(self):
         self.stats.flush()
-        path = self.backup_service.manual_backup()
+        self.backup_service.manual_backup()
+
+    def _on_backup_finished(self, kind, path):
         if path:
-            self.tray.showMessage("备份成功", f"备份已保存至: {os.path.basename(path)}", QSystemTrayIcon.Information, 2000)
+            if kind == "manual":
+                msg = f"备份已保存至: {os.path.basename(path)}"
+                report = self.backup_service.last_report
+                if report:
+                    msg += f"\n新增 {report['bytes_out'] / 1024:.1f} KB，用时 {report['seconds']:.2f} 秒"
+                self.tray.showMessage("备份成功", msg, QSystemTrayIcon.Information, 2000)
+        else:
+            self.tray.showMessage("备份失败", "备份文件写入失败", QSystemTrayIcon.Warning, 2000)
 
     def _toggle_auto_backup(self, checked):
         self.backup_service.set_auto_backup_enabled(checked)
 
     def _import_backup(self):
         from PySide6.QtWidgets import QFileDialog
-        path, _ = QFileDialog.getOpenFileName(self, "选择备份文件", self.backup_service.backup_dir, "Zip Files (*.zip)")
+        if self.backup_service.is_importing():
+            return
+        path, _ = QFileDialog.getOpenFileName(self, "选择备份文件", self.backup_service.backup_dir, "备份文件 (*.json *.zip)")
         if path:
-            success, msg = self.backup_service.import_backup(path, self.stats)
-            if success:
-                # Reload skin if config was updated during import
-                # ConfigService.load() might be needed if config object isn't shared/updated by reference, 
-                # but backup_service updates self.config in place.
-                
-                # Check if skin changed in config vs current UI
-                current_skin_id = self.config.get("skinId", "default")
-                self._reload_skin()
-                
-                QMessageBox.information(self, "导入成功", "数据已成功恢复")
-            else:
-                QMessageBox.warning(self, "导入失败", msg)
+            # Extraction and validation run on a worker; the timer keeps ticking
+            self.backup_service.import_backup_async(path, self.stats)
+
+    def _on_import_progress(self, done, total):
+        self.tray.setToolTip(f"正在导入备份 {done}/{total}")
+
+    def _on_skin_dir_moved(self, old_dir, new_dir):
+        # The running skin keeps reading its frames from the retired copy until the reload swaps it
+        if hasattr(self.frames, "rebase"):
+            self.frames.rebase(old_dir, new_dir)
+
+    def _on_import_finished(self, success, msg):
+        self.tray.setToolTip("")
+        if success:
+            # backup_service updates self.config in place; pick up the restored skin
+            self._reload_skin()
+            QMessageBox.information(self, "导入成功", "数据已成功恢复")
+        else:
+            QMessageBox.warning(self, "导入失败", msg)
+
+    def _toggle_perf_overlay(self, checked):
+        self.config["perfOverlay"] = checked
+
+    def _apply_perf(self):
+        """Probes run while the overlay is on or BITOMATO_PROFILE is set; otherwise they are removed."""
+        if self.config.perfOverlay or os.environ.get("BITOMATO_PROFILE"):
+            perf.enable()
+        else:
+            perf.disable()
+        if self.config.perfOverlay:
+            self._perf_timer.start()
+            self._update_overlay()
+        elif self._overlay is not None:
+            self._perf_timer.stop()
+            self._overlay = None
+            if self.isVisible():
+                self._refresh()
+
+    def _pending_writes(self):
+        backup_busy = self._backup_service is not None and self._backup_service.is_busy()
+        return int(ConfigService.has_pending()) + int(self.stats.has_pending()) + int(backup_busy)
+
+    def _update_overlay(self):
+        self._overlay = perf.overlay_lines(self._pending_writes())
+        if self.isVisible():
+            self._refresh()
+
+    def _dump_profile(self):
+        if not perf.enabled():
+            # Nothing recorded yet: start sampling now, export after reproducing the lag
+            perf.enable()
+            self.tray.showMessage("性能诊断", "已开启性能采样，请复现问题后再次导出快照", QSystemTrayIcon.Information, 3000)
+            return
+        extra = {
+            "skin": {"id": self.config.skinId, "frames": len(self.frames), "animated": self.is_animated},
+            "uiScale": self.scale,
+            "statsBackend": self.config.statsBackend,
+            "refresh_hz": round(1.0 / self._frame_interval(), 1),
+            "pending_writes": self._pending_writes(),
+            "timer_running": self.timer_service.running,
+        }
+        try:
+            path = perf.dump(os.path.join(os.getcwd(), "profiles"), extra)
+        except Exception as e:
+            QMessageBox.warning(self, "导出失败", f"性能快照写入失败：{e}")
+            return
+        self.tray.showMessage("性能诊断", f"性能快照已保存至: {os.path.basename(path)}", QSystemTrayIcon.Information, 2000)
 
     def _view_backups(self):
         self.backup_service.open_backup_folder()
@@ -249,9 +366,10 @@ class MainWindow(QWidget):
             self.hide()
 
     def showEvent(self, event):
-        self._compose()
-        if self.is_animated and not self.anim.isActive():
-            self.anim.start()
+        # The first paint composes whatever changed while hidden
+        self._frame_pending = True
+        if not self.anim.isActive():
+            self._schedule_frame(restart=True)
         super().showEvent(event)
 
     def hideEvent(self, event):
@@ -261,15 +379,14 @@ class MainWindow(QWidget):
 
     def _apply_scale(self):
         self.setFixedSize(int(256 * self.scale), int(256 * self.scale))
-        self.update()
+        self.frames.set_scale(self.scale)
+        self._refresh()
 
     def _adjust_scale(self):
+        from ui.scale_dialog import ScaleDialog
         dlg = ScaleDialog(self.scale, self)
         if dlg.exec():
-            self.scale = dlg.value()
-            self.config["uiScale"] = self.scale
-            ConfigService.save(self.config)
-            self._apply_scale()
+            self.config["uiScale"] = dlg.value()
 
     def _change_skin(self):
         initial_dir = os.path.join(ROOT, "skins")
@@ -278,31 +395,60 @@ class MainWindow(QWidget):
             
         folder = QFileDialog.getExistingDirectory(self, "选择皮肤文件夹", initial_dir)
         if folder:
-            try:
-                # Test loading skin first
-                load_skin(folder)
-                # If successful, save and apply
-                self.config["skinId"] = folder
-                ConfigService.save(self.config)
-                self._reload_skin()
-            except Exception as e:
-                QMessageBox.warning(self, "皮肤加载失败", f"无效的皮肤文件夹：\n{str(e)}\n\n请确保文件夹内包含 256x256 的 skin.png 或序列帧。")
-
-    def _reload_skin(self):
+            # Validation and activation share a single background load
+            self._start_skin_load(folder)
+
+    def _start_skin_load(self, skin_id):
+        task = load_skin_async(skin_id, self.scale)
+        task.progress.connect(self._on_skin_progress)
+        task.loaded.connect(self._on_skin_loaded)
+        task.failed.connect(self._on_skin_failed)
+        self._skin_task = task
+
+    def _on_skin_progress(self, done, total):
+        self.tray.setToolTip(f"正在加载皮肤 {done}/{total}")
+
+    def _on_skin_loaded(self, skin):
+        if self.sender() is not self._skin_task:
+            return  # superseded by a newer load
+        self._skin_task = None
+        self.tray.setToolTip("")
+        self.config["skinId"] = skin.skin_id
+        self._reload_skin(skin)
+
+    def _on_skin_failed(self, msg):
+        if self.sender() is not self._skin_task:
+            return
+        self._skin_task = None
+        self.tray.setToolTip("")
+        QMessageBox.warning(self, "皮肤加载失败", f"无效的皮肤文件夹：\n{msg}\n\n请确保文件夹内包含 256x256 的 skin.png 或序列帧。")
+
+    def _reload_skin(self, skin=None):
+        """
+        Activate the configured skin. Without a matching preloaded LoadedSkin
+        the skin is loaded in the background and activated when ready;
+        the countdown keeps running meanwhile.
+        """
         skin_id = self.config.get("skinId", "default")
+        if skin is None or skin.skin_id != skin_id:
+            self._start_skin_load(skin_id)
+            return
         if os.path.isabs(skin_id):
             skin_path = skin_id
         else:
             skin_path = os.path.join(ROOT, "skins", skin_id)
-            
-        self.frames, self.is_animated, self.skin_meta = load_skin(skin_id)
+
+        # Swap frames and metadata together
+        frames = skin.frames()
+        frames.set_scale(self.scale)
+        self.frames, self.is_animated, self.skin_meta = frames, skin.animated, skin.meta
+        if self._backup_service is not None:
+            self._backup_service.release_retired_skins()
         
         # Apply skin text color if defined
         if "textColor" in self.skin_meta:
             self.config["textColor"] = self.skin_meta["textColor"]
-            self.text_color = QColor(self.config["textColor"])
             
-        self.frame_index = 0
         self.renderer.reload(skin_path)
         
         # Update tray icon
@@ -320,14 +466,9 @@ class MainWindow(QWidget):
                 icon = QIcon(pm)
         self.tray.setIcon(icon)
         
-        # Restart animation if needed
-        if self.is_animated:
-            self.anim.start()
-        else:
-            self.anim.stop()
-            
-        self._compose()
-        self.update()
+        # Restart animation with the new skin's timeline
+        self._restart_animation()
+        self._refresh()
 
     def _toggle_running(self):
         if self.timer_service.running:
@@ -336,25 +477,21 @@ class MainWindow(QWidget):
         else:
             self.timer_service.start()
             self.show_pause_icon = True
-        self._compose()
-        self.update()
+        self._refresh()
 
     def _reset(self):
         self.timer_service.reset()
         self.show_pause_icon = False
-        self._compose()
-        self.update()
+        self._refresh()
 
     def _on_ticked(self, mm, ss):
         self.text = "{:02d}:{:02d}".format(mm, ss)
         if self.isVisible():
-            self._compose()
-            self.update()
+            self._refresh()
 
     def _on_phase(self, phase):
         if self.isVisible():
-            self._compose()
-            self.update()
+            self._refresh()
 
     def _on_completed(self):
         # Stop at 00:00 and flash red/white 3 cycles always; sound optional
@@ -363,48 +500,132 @@ class MainWindow(QWidget):
         self._flash_remaining = 6
         self.flash_timer.start()
         self.stats.flush()
-        self.backup_service.auto_backup()
+        if self.config.autoBackup:
+            self.backup_service.auto_backup()
         if self.isVisible():
-            self._compose()
-            self.update()
+            self._refresh()
+
+    def _save_config(self, keys):
+        # Debounced in ConfigService; a burst of changes is one write
+        ConfigService.save(self.config)
+
+    def _on_config_changed(self, groups):
+        """Apply a config change per group, touching only the affected state and layers."""
+        if "text_style" in groups and not self.flash_timer.isActive():
+            self.text_color = self.config.text_qcolor
+        if "animation" in groups:
+            self._restart_animation(keep_position=True)
+        if "diagnostics" in groups:
+            self._apply_perf()
+        if "scale" in groups and self.scale != self.config.uiScale:
+            self.scale = self.config.uiScale
+            self._apply_scale()
+        elif self.isVisible():
+            # The renderer re-rasterises only layers whose inputs changed
+            self._refresh()
 
     def _flash_step(self):
-        normal_color = QColor(self.config.get("textColor", "#FFFFFF"))
+        normal_color = self.config.text_qcolor
         if self._flash_remaining <= 0:
             self.flash_timer.stop()
             self.text_color = normal_color
             if self.isVisible():
-                self._compose()
-                self.update()
+                self._refresh()
             return
         is_red = (self.text_color == QColor(255, 0, 0))
         self.text_color = normal_color if is_red else QColor(255, 0, 0)
-        if not is_red and self.config.get("soundEnabled", False):
+        if not is_red and self.config.soundEnabled:
             try:
                 self.audio.play_end()
             except Exception:
                 pass
         self._flash_remaining -= 1
         if self.isVisible():
-            self._compose()
-            self.update()
+            self._refresh()
+
+    def _restart_animation(self, keep_position=False):
+        """Rebuild the frame timeline from skin.json and frameDuration."""
+        self._timeline, self._loop_at = frame_timeline(self.skin_meta, len(self.frames), self.config.frameDuration)
+        if not keep_position or self._step >= len(self._timeline):
+            self._step = 0
+        self.frame_index = self._timeline[self._step][0]
+        self.anim.stop()
+        if self.isVisible():
+            self._schedule_frame(restart=True)
+
+    def _schedule_frame(self, restart=False):
+        if not self.is_animated or len(self._timeline) < 2:
+            return
+        if self._step == self._loop_at == len(self._timeline) - 1:
+            return  # looping a single frame: nothing ever changes again
+        now = time.monotonic()
+        if restart:
+            self._frame_due = now
+        # Deadlines accumulate from the previous one, so timer latency never drifts the cadence
+        self._frame_due = max(self._frame_due, now - 0.1) + self._timeline[self._step][1] / 1000.0
+        self.anim.start(max(0, int(round((self._frame_due - now) * 1000))))
 
     def _next_frame(self):
-        self.frame_index = (self.frame_index + 1) % len(self.frames)
+        self._step += 1
+        if self._step >= len(self._timeline):
+            self._step = self._loop_at
+        self.frame_index = self._timeline[self._step][0]
+        # Request the present before re-arming anim: _refresh skips only
+        # when a pending animation frame will present the change itself
         if self.isVisible():
-            self._compose()
-            self.update()
+            self._refresh()
+        self._schedule_frame()
 
     def paintEvent(self, event):
-        if self._composed is None:
+        rect = event.rect()
+        if self._composed is None or self._frame_pending:
+            # A paint (expose, resize) arrived before the scheduled frame; compose now
+            self._frame_pending = False
+            self._last_present = time.monotonic()
             self._compose()
+            # This paint only covers the exposed area; repaint the rest of what changed too
+            missed = QRegion(self._dirty_rect).subtracted(event.region())
+            if not missed.isEmpty():
+                self.update(missed)
         composed = self._composed
         p = QPainter(self)
         # Ensure sharp upscaling on High DPI displays
         p.setRenderHint(QPainter.SmoothPixmapTransform, False)
-        p.drawPixmap(0, 0, composed)
+        p.setCompositionMode(QPainter.CompositionMode_Source)
+        p.drawPixmap(rect, composed, rect)
         p.end()
 
+    def _refresh(self):
+        """
+        Mark the window dirty. Ticks, animation and flashing all land here;
+        the frame timer composes at most once per display refresh, so
+        coinciding requests share a single compose.
+        """
+        self._frame_pending = True
+        if self._frame_timer.isActive():
+            return
+        if self.anim.isActive() and self.anim.remainingTime() <= self._frame_interval() * 1000:
+            return  # the imminent animation frame carries this change
+        wait = 0.0
+        if self._last_present is not None:
+            wait = self._last_present + self._frame_interval() - time.monotonic()
+        self._frame_timer.start(max(0, int(math.ceil(wait * 1000))))
+
+    def _frame_interval(self):
+        screen = self.screen()
+        rate = screen.refreshRate() if screen is not None else 0
+        return 1.0 / (rate if rate > 0 else 60.0)
+
+    def _present_frame(self):
+        if not self._frame_pending or not self.isVisible():
+            return  # stays pending while hidden; showEvent picks it up
+        self._frame_pending = False
+        self._last_present = time.monotonic()
+        # Recompose and repaint only the area the renderer actually touched
+        self._compose()
+        if not self._dirty_rect.isEmpty():
+            self.update(self._dirty_rect)
+
     def _compose(self):
         frame = self.frames[self.frame_index]
         self._composed = self.renderer.compose(
@@ -414,10 +635,12 @@ class MainWindow(QWidget):
             self.show_setting_icon, 
             scale=self.scale, 
             text_color=self.text_color,
-            outline_enabled=self.config.get("textOutlineEnabled", False),
-            outline_color=QColor(self.config.get("textOutlineColor", "#000000")),
-            outline_width=self.config.get("textOutlineWidth", 2)
+            outline_enabled=self.config.textOutlineEnabled,
+            outline_color=self.config.outline_qcolor,
+            outline_width=self.config.textOutlineWidth,
+            overlay=self._overlay
         )
+        self._dirty_rect = self.renderer.dirty_rect
 
     def mousePressEvent(self, event):
         x = event.position().x()
@@ -445,29 +668,11 @@ class MainWindow(QWidget):
             self._dragging = False
 
     def _open_settings(self):
-        old_skin = self.config.get("skinId")
+        from ui.settings_dialog import SettingsDialog
         dlg = SettingsDialog(self.config, stats=self.stats, parent=self)
         if dlg.exec():
-            ConfigService.save(self.config)
-            
-            # Update text color immediately
-            self.text_color = QColor(self.config.get("textColor", "#FFFFFF"))
-            
-            # Apply new outline settings to renderer if necessary or handled in _compose via config
-            # But renderer.compose needs explicit arguments or we update main window properties
-            
-            # Check if skin changed
-            if self.config.get("skinId") != old_skin:
-                self._reload_skin()
-            
-            # Only update animation interval, don't force pause/reset unless initiated by dialog
-            self.anim.setInterval(self.config.get("frameDuration", 100))
-            
-            # Update UI state if timer service was reset by dialog
-            if not self.timer_service.running:
-                self.show_pause_icon = False
-            else:
-                self.show_pause_icon = True
-                
-            self._compose()
-        self.update()
+            # Text style, animation, scale and timing follow the config change
+            # bus; an unchanged dialog therefore costs no redraw and no write.
+            if "skinId" in dlg.changed_keys:
+                # Reuse the load the dialog already did to validate the folder
+                self._reload_skin(dlg.loaded_skin)
@@ -2,7 +2,8 @@ from PySide6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QL
 import os
 from ui.stats_dialog import StatsDialog
 from ui.scale_dialog import ScaleDialog
-from skin.loader import load_skin
+from skin.loader import load_skin_async
+from services.config_service import groups_for
 from PySide6.QtGui import QColor
 
 class SettingsDialog(QDialog):
@@ -29,6 +30,11 @@ class SettingsDialog(QDialog):
         self._outline_enabled = self._initial["textOutlineEnabled"]
         self._outline_color = self._initial["textOutlineColor"]
         self._outline_width = self._initial["textOutlineWidth"]
+        self._skin_task = None
+        # Skin validated by _change_skin, handed to MainWindow for activation
+        self.loaded_skin = None
+        # Keys actually changed by _save
+        self.changed_keys = frozenset()
 
         main_layout = QVBoxLayout()
 
@@ -230,36 +236,28 @@ class SettingsDialog(QDialog):
             self.manual_break.setChecked(False)
 
     def _save(self):
-        # Capture new values
-        new_work = int(self.work.value())
-        new_break = int(self.breakm.value())
-        new_countup = bool(self.countup.isChecked())
-        
-        # Check if timer-critical settings changed
-        timer_changed = (
-            new_work != self._initial["workMinutes"] or
-            new_break != self._initial["shortBreakMinutes"] or
-            new_countup != bool(self.config.get("countUpMode", False))
-        )
+        values = {
+            "workMinutes": int(self.work.value()),
+            "shortBreakMinutes": int(self.breakm.value()),
+            "frameDuration": int(self.duration.value()),
+            "soundEnabled": bool(self.sound.isChecked()),
+            "manualBreak": bool(self.manual_break.isChecked()),
+            "countUpMode": bool(self.countup.isChecked()),
+            "skinId": self._skin_id,
+            "textColor": self._text_color,
+            "textOutlineEnabled": self._outline_enabled,
+            "textOutlineColor": self._outline_color,
+            "textOutlineWidth": self._outline_width,
+        }
+        # Only keys whose value differs are applied; nothing changed means no events at all
+        self.changed_keys = self.config.update(values)
 
-        self.config["workMinutes"] = new_work
-        self.config["shortBreakMinutes"] = new_break
-        self.config["frameDuration"] = int(self.duration.value())
-        self.config["soundEnabled"] = bool(self.sound.isChecked())
-        self.config["manualBreak"] = bool(self.manual_break.isChecked())
-        self.config["countUpMode"] = new_countup
-        self.config["skinId"] = self._skin_id
-        self.config["textColor"] = self._text_color
-        self.config["textOutlineEnabled"] = self._outline_enabled
-        self.config["textOutlineColor"] = self._outline_color
-        self.config["textOutlineWidth"] = 1
-        
         # Only reset if timer settings changed
-        if timer_changed:
+        if "timing" in groups_for(self.changed_keys):
             parent = self.parent()
             if hasattr(parent, "_reset"):
                 parent._reset()
-                    
+
         self.accept()
 
     def _show_stats(self):
@@ -270,13 +268,8 @@ class SettingsDialog(QDialog):
         current = float(self.config.get("uiScale", 1))
         dlg = ScaleDialog(current, self)
         if dlg.exec():
-            val = dlg.value()
-            self.config["uiScale"] = val
-            parent = self.parent()
-            if hasattr(parent, "scale"):
-                parent.scale = val
-            if hasattr(parent, "_apply_scale"):
-                parent._apply_scale()
+            # The window follows through the config "scale" group
+            self.config["uiScale"] = dlg.value()
 
     def _change_skin(self):
         # Determine initial directory
@@ -288,31 +281,56 @@ class SettingsDialog(QDialog):
             
         folder = QFileDialog.getExistingDirectory(self, "选择皮肤文件夹", initial_dir)
         if folder:
-            try:
-                _, _, meta = load_skin(folder)
-                self._skin_id = folder
-                self.skin_label.setText(self._get_skin_name(folder))
-                
-                if "textColor" in meta:
-                    self._text_color = meta["textColor"]
-                    self.color_preview.setStyleSheet(f"background-color: {self._text_color}; border: 1px solid gray;")
-                
-                if "textOutlineEnabled" in meta:
-                    self._outline_enabled = bool(meta["textOutlineEnabled"])
-                    self.outline_check.setChecked(self._outline_enabled)
-                    self.outline_group.setEnabled(self._outline_enabled)
-                    
-                if "textOutlineColor" in meta:
-                    self._outline_color = meta["textOutlineColor"]
-                    self.outline_color_preview.setStyleSheet(f"background-color: {self._outline_color}; border: 1px solid gray;")
-                    
-                if "textOutlineWidth" in meta:
-                    # Deprecated: width is always 1
-                    # self._outline_width = int(meta["textOutlineWidth"])
-                    # self.outline_width_spin.setValue(self._outline_width)
-                    pass
-            except Exception as e:
-                QMessageBox.warning(self, "皮肤加载失败", f"无效的皮肤文件夹：\n{str(e)}\n\n请确保文件夹内包含 256×256 的 skin.png 或序列帧。")
+            # Validate in the background; the timer window keeps ticking
+            scale = float(self.config.get("uiScale", 1))
+            self._skin_task = load_skin_async(folder, scale)
+            self._skin_task.progress.connect(self._on_skin_progress)
+            self._skin_task.loaded.connect(self._on_skin_loaded)
+            self._skin_task.failed.connect(self._on_skin_failed)
+            self.skin_btn.setEnabled(False)
+            self.skin_label.setText("加载中...")
+
+    def _on_skin_progress(self, done, total):
+        if self.sender() is self._skin_task:
+            self.skin_label.setText(f"加载中 {done}/{total}")
+
+    def _on_skin_failed(self, msg):
+        if self.sender() is not self._skin_task:
+            return
+        self._skin_task = None
+        self.skin_btn.setEnabled(True)
+        self.skin_label.setText(self._get_skin_name(self._skin_id))
+        QMessageBox.warning(self, "皮肤加载失败", f"无效的皮肤文件夹：\n{msg}\n\n请确保文件夹内包含 256×256 的 skin.png 或序列帧。")
+
+    def _on_skin_loaded(self, skin):
+        if self.sender() is not self._skin_task:
+            return
+        self._skin_task = None
+        self.skin_btn.setEnabled(True)
+        self.loaded_skin = skin
+        meta = skin.meta
+        folder = skin.skin_id
+        self._skin_id = folder
+        self.skin_label.setText(self._get_skin_name(folder))
+
+        if "textColor" in meta:
+            self._text_color = meta["textColor"]
+            self.color_preview.setStyleSheet(f"background-color: {self._text_color}; border: 1px solid gray;")
+
+        if "textOutlineEnabled" in meta:
+            self._outline_enabled = bool(meta["textOutlineEnabled"])
+            self.outline_check.setChecked(self._outline_enabled)
+            self.outline_group.setEnabled(self._outline_enabled)
+
+        if "textOutlineColor" in meta:
+            self._outline_color = meta["textOutlineColor"]
+            self.outline_color_preview.setStyleSheet(f"background-color: {self._outline_color}; border: 1px solid gray;")
+
+        if "textOutlineWidth" in meta:
+            # Deprecated: width is always 1
+            # self._outline_width = int(meta["textOutlineWidth"])
+            # self.outline_width_spin.setValue(self._outline_width)
+            pass
 
     def _select_text_color(self):
         dlg = QColorDialog(QColor(self._text_color), self)
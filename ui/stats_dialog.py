@@ -18,6 +18,11 @@ class StatsDialog(QDialog):
         favorites = summary.get("favorite_slots", [])
         layout.addWidget(QLabel(f"总共专注次数：{sessions}"))
         layout.addWidget(QLabel(f"总共专注时长：{hours}小时{mins_rem}分钟"))
+        periods = stats_service.summaries_for(("day", "week", "month"))
+        for period, label in (("day", "今日"), ("week", "本周"), ("month", "本月")):
+            part = periods[period]
+            part_minutes = part["focus_seconds"] // 60
+            layout.addWidget(QLabel(f"{label}专注：{part['focus_sessions']}次，{part_minutes // 60}小时{part_minutes % 60}分钟"))
         if favorites:
             zh_map = {
                 "midnight": "午夜",
@@ -0,0 +1,40 @@
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+from PySide6.QtWidgets import QApplication
+
+from services.backup_service import BackupService, _entry_parts
+from services.config_service import Config
+
+# Ensure QApplication exists
+app = QApplication.instance() or QApplication(sys.argv)
+
+class TestBackupImportPaths(unittest.TestCase):
+    def setUp(self):
+        self.work = tempfile.mkdtemp(prefix="bitomato_import_")
+        self.service = BackupService(Config({}))
+        self.service.root_dir = self.work
+
+    def tearDown(self):
+        shutil.rmtree(self.work, ignore_errors=True)
+
+    def test_entry_names_cannot_escape(self):
+        self.assertEqual(_entry_parts("skin_backup/a/skin_001.png"), ["skin_backup", "a", "skin_001.png"])
+        for name in ("skin_backup/a/../../x", "/etc/passwd", "skin_backup/a/C:x", "skin_backup/a\\..\\x", "skin_backup//x"):
+            self.assertIsNone(_entry_parts(name), name)
+
+    def test_traversal_archive_is_rejected(self):
+        path = os.path.join(self.work, "evil.zip")
+        with zipfile.ZipFile(path, "w") as z:
+            z.writestr("stats.json", "{}")
+            z.writestr("skin_backup/x/../../../outside.json", "{}")
+        ok, msg = self.service._stage_import(path)
+        self.assertFalse(ok)
+        self.assertFalse(os.path.exists(os.path.join(os.path.dirname(self.work), "outside.json")))
+        self.assertFalse(os.path.exists(os.path.join(self.work, "outside.json")))
+
+if __name__ == '__main__':
+    unittest.main()
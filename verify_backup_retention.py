@@ -0,0 +1,44 @@
+import unittest
+import datetime
+
+from services.backup_service import plan_retention
+
+def name_for(ts):
+    return ts.strftime("backup_%Y%m%d_%H%M%S.json")
+
+class TestBackupRetention(unittest.TestCase):
+    def setUp(self):
+        self.now = datetime.datetime(2024, 6, 30, 12, 0, 0)  # a Sunday
+
+    def test_keeps_last_n(self):
+        names = [name_for(self.now - datetime.timedelta(minutes=i)) for i in range(20)]
+        doomed = plan_retention(names, self.now, keep_last=5, keep_daily=0, keep_weekly=0)
+        self.assertEqual(len(doomed), 15)
+        self.assertNotIn(names[0], doomed)
+        self.assertIn(names[5], doomed)
+
+    def test_daily_keeps_newest_per_day(self):
+        names = [name_for(self.now - datetime.timedelta(hours=6 * i)) for i in range(40)]  # 10 days
+        doomed = plan_retention(names, self.now, keep_last=0, keep_daily=3, keep_weekly=0)
+        kept = sorted(set(names) - set(doomed))
+        self.assertEqual([n[7:15] for n in kept], ["20240628", "20240629", "20240630"])
+        self.assertIn(name_for(self.now), kept)
+
+    def test_weekly_keeps_newest_per_iso_week(self):
+        names = [name_for(self.now - datetime.timedelta(days=i)) for i in range(60)]
+        doomed = plan_retention(names, self.now, keep_last=0, keep_daily=0, keep_weekly=4)
+        kept = set(names) - set(doomed)
+        # Sundays are the newest day of each ISO week
+        self.assertEqual(kept, {name_for(self.now - datetime.timedelta(weeks=w)) for w in range(4)})
+
+    def test_ignores_foreign_names(self):
+        names = ["auto_backup.json", "notes.txt", "backup_garbage.zip", name_for(self.now - datetime.timedelta(days=400))]
+        doomed = plan_retention(names, self.now, keep_last=0, keep_daily=7, keep_weekly=4)
+        self.assertEqual(doomed, [names[3]])
+
+    def test_legacy_zip_names(self):
+        names = [self.now.strftime("backup_%Y%m%d_%H%M%S.zip"), "backup_20200101_000000.zip"]
+        self.assertEqual(plan_retention(names, self.now, 1, 0, 0), ["backup_20200101_000000.zip"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import sys
+import time
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QObject, QTimer, QRect, Qt
+
+from skin.loader import frame_timeline
+from ui.main_window import MainWindow
+
+# Ensure QApplication exists
+app = QApplication.instance() or QApplication(sys.argv)
+
+class SchedulerHarness(QObject):
+    """MainWindow's frame scheduler without the window around it."""
+    _refresh = MainWindow._refresh
+    _next_frame = MainWindow._next_frame
+    _schedule_frame = MainWindow._schedule_frame
+    _present_frame = MainWindow._present_frame
+
+    def __init__(self, meta, count, refresh_rate=60.0):
+        super().__init__()
+        self.refresh_rate = refresh_rate
+        self.is_animated = True
+        self._timeline, self._loop_at = frame_timeline(meta, count)
+        self._step = 0
+        self._frame_due = 0.0
+        self.frame_index = 0
+        self.text = ""
+        self.presented = []
+        self._frame_pending = False
+        self._last_present = None
+        self._dirty_rect = QRect()
+        self.anim = QTimer()
+        self.anim.setSingleShot(True)
+        self.anim.setTimerType(Qt.PreciseTimer)
+        self.anim.timeout.connect(self._next_frame)
+        self._frame_timer = QTimer()
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.setTimerType(Qt.PreciseTimer)
+        self._frame_timer.timeout.connect(self._present_frame)
+
+    def isVisible(self):
+        return True
+
+    def _frame_interval(self):
+        return 1.0 / self.refresh_rate
+
+    def _compose(self):
+        self.presented.append(self.text)
+        self._dirty_rect = QRect(0, 0, 256, 256)
+
+    def update(self, rect):
+        pass
+
+class TestFrameScheduler(unittest.TestCase):
+    def test_frame_durations_clamped_above_refresh_interval(self):
+        timeline, _ = frame_timeline({"frameDurations": [16, 16]}, 2)
+        self.assertTrue(all(ms > 1000 / 60 for _, ms in timeline))
+
+    def test_fast_animation_presents_every_tick(self):
+        # At 30 Hz even clamped frames are shorter than one refresh interval
+        for rate in (60.0, 30.0):
+            self._run_ticks(SchedulerHarness({"frameDurations": [16, 16]}, 2, rate))
+
+    def _run_ticks(self, win):
+        win._schedule_frame(restart=True)
+        for tick in range(5):
+            win.text = str(tick)
+            win._refresh()
+            deadline = time.monotonic() + 0.1
+            while time.monotonic() < deadline:
+                app.processEvents()
+            self.assertIn(str(tick), win.presented, win.refresh_rate)
+        win.anim.stop()
+
+if __name__ == '__main__':
+    unittest.main()
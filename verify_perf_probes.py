@@ -0,0 +1,35 @@
+import unittest
+from PySide6.QtWidgets import QApplication
+import sys
+
+from services import perf
+from services.timer_service import TimerService, ManualTicks
+from services.config_service import Config
+
+# Ensure QApplication exists
+app = QApplication.instance() or QApplication(sys.argv)
+
+class TestPerfProbes(unittest.TestCase):
+    def tearDown(self):
+        perf.disable()
+
+    def test_disable_restores_original_methods(self):
+        original = TimerService.__dict__["_on_tick"]
+        perf.enable()
+        self.assertIsNot(TimerService.__dict__["_on_tick"], original)
+        perf.disable()
+        self.assertIs(TimerService.__dict__["_on_tick"], original)
+        self.assertFalse(perf.enabled())
+
+    def test_records_ticks_of_existing_instances(self):
+        ticks = ManualTicks()
+        timer = TimerService(Config({}), tick_source=ticks)
+        timer.start()
+        perf.enable()
+        before = perf.probe("tick").count
+        ticks.fire()
+        self.assertEqual(perf.probe("tick").count, before + 1)
+        self.assertIn("tick", perf.snapshot()["probes"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -86,6 +86,13 @@ class TestSettingsResetLogic(unittest.TestCase):
             
         self.assertTrue(parent._reset_called)
         self.assertFalse(parent.timer_service.running)
+    def test_untouched_dialog_changes_nothing(self):
+        from services.config_service import Config
+        from ui.settings_dialog import SettingsDialog
+        for data in ({}, {"textOutlineWidth": 3, "workMinutes": 40}):
+            dlg = SettingsDialog(Config(data))
+            dlg._save()
+            self.assertEqual(dlg.changed_keys, set(), data)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from PySide6.QtWidgets import QApplication
+import sys
+
+from services.timer_service import TimerService
+from services.config_service import Config
+
+# Ensure QApplication exists
+app = QApplication.instance() or QApplication(sys.argv)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class MockStats:
+    def __init__(self):
+        self.seconds = []
+        self.sessions = 0
+
+    def record_session(self, start, end, duration, phase, outcome):
+        self.seconds.append(duration)
+        if duration >= 120:
+            self.sessions += 1
+
+class TestMonotonicTimer(unittest.TestCase):
+    def setUp(self):
+        self.config = Config({
+            "workMinutes": 25,
+            "shortBreakMinutes": 5,
+            "longBreakMinutes": 15,
+            "sessionsBeforeLongBreak": 4,
+            "countUpMode": False
+        })
+        self.stats = MockStats()
+        self.timer = TimerService(self.config, stats_service=self.stats)
+        self.clock = FakeClock()
+        self.timer._clock = self.clock
+        self.shown = []
+        self.timer.ticked.connect(lambda mm, ss: self.shown.append((mm, ss)))
+
+    def test_stalled_ticks_do_not_stretch_session(self):
+        self.timer.start()
+        # One tick arrives after a 61.5 s stall of the event loop
+        self.clock.now += 61.5
+        self.timer._on_tick()
+        self.assertEqual(self.shown[-1], (23, 59))
+
+    def test_paused_time_is_excluded(self):
+        self.timer.start()
+        self.clock.now += 10
+        self.timer.pause()
+        self.clock.now += 300
+        self.timer.start()
+        self.clock.now += 5
+        self.timer._on_tick()
+        self.assertAlmostEqual(self.timer.elapsed(), 15)
+        self.assertEqual(self.shown[-1], (24, 45))
+
+    def test_completion_at_deadline_counts_once(self):
+        self.timer.start()
+        self.clock.now += 25 * 60
+        self.timer._on_tick()
+        self.assertFalse(self.timer.running)
+        self.assertEqual(self.timer.pending_next_phase, "SHORT_BREAK")
+        self.assertEqual(self.stats.seconds, [1500])
+        # Resetting after completion must not record the session again
+        self.timer.reset()
+        self.assertEqual(self.stats.sessions, 1)
+
+    def test_countup_caps_at_90_minutes(self):
+        self.config["countUpMode"] = True
+        self.timer.reset()
+        self.timer.start()
+        self.clock.now += 95 * 60
+        self.timer._on_tick()
+        self.assertFalse(self.timer.running)
+        self.assertEqual(self.stats.seconds, [90 * 60])
+
+class TestConfigCoercion(unittest.TestCase):
+    def test_bool_strings_and_bad_values(self):
+        config = Config({"soundEnabled": "false", "manualBreak": "On", "countUpMode": 0, "autoBackup": "maybe", "alwaysOnTop": 7})
+        self.assertIs(config["soundEnabled"], False)
+        self.assertIs(config["manualBreak"], True)
+        self.assertIs(config["countUpMode"], False)
+        self.assertIs(config["autoBackup"], False)  # unrecognised: default
+        self.assertIs(config["alwaysOnTop"], True)  # unrecognised: default
+
+if __name__ == '__main__':
+    unittest.main()